@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import os
 import time
 import logging
@@ -15,17 +15,18 @@ from .middleware.security import (
     rate_limit_middleware,
     security_logging_middleware,
     SecurityHeaders,
-    validate_cors_origins
+    validate_cors_origins,
+    get_client_ip
 )
 from .monitoring.health import metrics_collector
-from .utils.logging import RequestLogger
+from .utils.logging import RequestLogger, setup_logging
 from .utils.error_handlers import setup_error_handlers
 
 # Load environment variables
 load_dotenv()
 
-# Import logging configuration (this sets up logging automatically)
-from .utils import logging as app_logging
+# Configure logging once, before the app starts emitting records
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +48,8 @@ app = FastAPI(
     """,
     version=settings.app_version,
     docs_url="/docs" if not settings.is_production else None,
-    redoc_url="/redoc" if not settings.is_production else None
+    redoc_url="/redoc" if not settings.is_production else None,
+    default_response_class=ORJSONResponse
 )
 
 # Security middleware for production
@@ -62,12 +64,8 @@ if settings.is_production:
 async def metrics_and_logging_middleware(request: Request, call_next):
     start_time = time.time()
     
-    # Get client IP
-    client_ip = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
-    if not client_ip:
-        client_ip = request.headers.get("X-Real-IP", "")
-    if not client_ip and request.client:
-        client_ip = request.client.host
+    # Get client IP (memoized for the error handlers further down the stack)
+    client_ip = get_client_ip(request)
     
     response = await call_next(request)
     process_time = time.time() - start_time
@@ -51,19 +51,22 @@ api_limiter = RateLimiter(max_requests=200, window_seconds=60)      # 200 API re
 
 
 def get_client_ip(request: Request) -> str:
-    """Extract client IP address from request"""
+    """Extract client IP address from request (memoized on request.state)"""
+    ip = getattr(request.state, "_client_ip", None)
+    if ip:
+        return ip
+    
     # Check for forwarded headers (common in production)
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
         # Take the first IP in the chain
-        return forwarded_for.split(",")[0].strip()
-    
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
+        ip = forwarded_for.split(",")[0].strip()
+    else:
+        # Fallback to direct client IP
+        ip = request.headers.get("X-Real-IP") or (request.client.host if request.client else "unknown")
     
-    # Fallback to direct client IP
-    return request.client.host if request.client else "unknown"
+    request.state._client_ip = ip
+    return ip
 
 
 async def rate_limit_middleware(request: Request, call_next):
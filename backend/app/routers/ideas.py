@@ -1,19 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text  # ← ADD THIS LINE
-from typing import Optional
+from typing import List, Optional
+import asyncio
 import logging
 from datetime import datetime
 import logging
 # ... other imports
 from ..database import get_db
 from ..models.idea import Idea, DevelopmentStage
-from ..schemas.idea import IdeaCreate, IdeaUpdate, IdeaResponse, IdeaListResponse
+from ..schemas.idea import IdeaCreate, IdeaBulkCreate, IdeaUpdate, IdeaResponse, IdeaListResponse
 from ..auth.auth import get_current_user
 from ..models.user import User
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+
+def _parse_ids(ids: str) -> List[int]:
+    """Parse a comma-separated ?ids= value"""
+    try:
+        return [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+
+
 @router.post("/", response_model=IdeaResponse, status_code=status.HTTP_201_CREATED)
 async def create_idea(
     idea: IdeaCreate,
@@ -46,8 +60,8 @@ async def create_idea(
             
             logger.info(f"Starting AI enhancement for idea {db_idea.id}")
             
-            # Step 1: AI refinement
-            refined_pitch = await ai_service.refine_idea(
+            # AI refinement and feasibility analysis in a single call
+            refined_pitch, (market, complexity, resources) = await ai_service.refine_and_score(
                 db_idea.title, 
                 db_idea.description, 
                 db_idea.development_stage.value
@@ -55,15 +69,6 @@ async def create_idea(
             db_idea.ai_refined_pitch = refined_pitch
             logger.info(f"AI refinement completed for idea {db_idea.id}")
             
-            # Step 2: Feasibility analysis
-            idea_data = {
-                "title": db_idea.title,
-                "description": db_idea.description,
-                "ai_refined_pitch": refined_pitch,
-                "development_stage": db_idea.development_stage.value
-            }
-            
-            market, complexity, resources = await ai_service.generate_feasibility_analysis(idea_data)
             db_idea.market_potential = market
             db_idea.technical_complexity = complexity
             db_idea.resource_requirements = resources
@@ -96,6 +101,66 @@ async def create_idea(
    
         
 
+@router.post("/bulk", response_model=List[IdeaResponse], status_code=status.HTTP_201_CREATED)
+async def create_ideas_bulk(
+    payload: IdeaBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create several ideas in one request, scored with a single batched AI call"""
+    try:
+        db_ideas = [
+            Idea(
+                title=idea.title,
+                description=idea.description,
+                development_stage=idea.development_stage,
+                created_by=current_user.id,
+                market_potential=5.0,
+                technical_complexity=5.0,
+                resource_requirements=5.0,
+                ai_validated=False
+            )
+            for idea in payload.items
+        ]
+        
+        # Batch feasibility scoring; refined pitches are left to /enhance
+        try:
+            from ..services.ai_service import ai_service
+            
+            scores = await ai_service.batch_feasibility([
+                {
+                    'title': idea.title,
+                    'description': idea.description,
+                    'development_stage': idea.development_stage.value
+                }
+                for idea in payload.items
+            ])
+            for db_idea, (market, complexity, resources) in zip(db_ideas, scores):
+                db_idea.market_potential = market
+                db_idea.technical_complexity = complexity
+                db_idea.resource_requirements = resources
+                
+        except Exception as ai_error:
+            logger.error(f"❌ AI batch scoring failed for {len(db_ideas)} ideas: {ai_error}")
+        
+        # One transaction for the whole batch
+        db.add_all(db_ideas)
+        db.commit()
+        for db_idea in db_ideas:
+            db.refresh(db_idea)
+        
+        logger.info(f"Created {len(db_ideas)} ideas in bulk for user {current_user.username}")
+        return db_ideas
+        
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error creating ideas in bulk: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create ideas"
+        )
+
+
 @router.get("/", response_model=IdeaListResponse)
 async def list_ideas(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
@@ -105,15 +170,20 @@ async def list_ideas(
     search: Optional[str] = Query(None, description="Search in title and description"),
     sort_by: Optional[str] = Query("created_at", description="Sort by field"),
     sort_order: Optional[str] = Query("desc", description="Sort order (asc/desc)"),
+    ids: Optional[str] = Query(None, description="Comma-separated idea IDs to restrict to"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)  # ← ADD THIS LINE
 ):
     """List ideas filtered by current authenticated user only"""
+    id_list = _parse_ids(ids) if ids else None
+    
     try:
         # ← ADD THIS CRITICAL FILTER
         query = db.query(Idea).filter(Idea.created_by == current_user.id)
         
         # Apply additional filters
+        if id_list is not None:
+            query = query.filter(Idea.id.in_(id_list))
         if stage:
             query = query.filter(Idea.development_stage == stage)
         if ai_validated is not None:
@@ -171,6 +241,44 @@ async def list_ideas(
         )
 
 
+@router.delete("/")
+async def delete_ideas_bulk(
+    ids: str = Query(..., description="Comma-separated idea IDs to delete"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete several ideas in one request (only those owned by the user)"""
+    id_list = _parse_ids(ids)
+    
+    try:
+        db_ideas = db.query(Idea).filter(
+            Idea.id.in_(id_list),
+            Idea.created_by == current_user.id
+        ).all()
+        
+        # Delete through the ORM so related insights cascade, in one transaction
+        for db_idea in db_ideas:
+            db.delete(db_idea)
+        db.commit()
+        
+        deleted_ids = [db_idea.id for db_idea in db_ideas]
+        logger.info(f"User {current_user.id} deleted {len(deleted_ids)} ideas in bulk: {deleted_ids}")
+        
+        return {
+            "message": "Ideas deleted successfully",
+            "deleted_idea_ids": deleted_ids,
+            "deleted_count": len(deleted_ids)
+        }
+        
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error deleting ideas {id_list}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete ideas"
+        )
+
+
 @router.get("/{idea_id}", response_model=IdeaResponse)
 async def get_idea(
     idea_id: int, 
@@ -326,23 +434,14 @@ async def enhance_idea_with_ai(
         
         logger.info(f"Manual AI enhancement started for idea {idea_id}")
         
-        # AI refinement
-        refined_pitch = await ai_service.refine_idea(
+        # AI refinement and feasibility analysis in a single call
+        refined_pitch, (market, complexity, resources) = await ai_service.refine_and_score(
             db_idea.title,
             db_idea.description,
             db_idea.development_stage.value
         )
         db_idea.ai_refined_pitch = refined_pitch
         
-        # Feasibility analysis
-        idea_data = {
-            "title": db_idea.title,
-            "description": db_idea.description,
-            "ai_refined_pitch": refined_pitch,
-            "development_stage": db_idea.development_stage.value
-        }
-        
-        market, complexity, resources = await ai_service.generate_feasibility_analysis(idea_data)
         db_idea.market_potential = market
         db_idea.technical_complexity = complexity
         db_idea.resource_requirements = resources
@@ -426,41 +525,33 @@ async def get_idea_insights(
         
         # Initialize tracking variables
         is_ai_generated = True
-        market_insights = ""
-        risk_assessment = ""
-        implementation_roadmap = ""
         
-        # Generate market insights with error handling
-        try:
-            logger.info(f"Generating market insights for idea {idea_id}")
-            market_insights = await ai_service.generate_market_insights(
+        # Market insights, risk assessment and roadmap are independent - run them concurrently
+        logger.info(f"Generating market insights, risk assessment and roadmap for idea {idea_id}")
+        market_insights, risk_assessment, implementation_roadmap = await asyncio.gather(
+            ai_service.generate_market_insights(
                 db_idea.title, 
                 db_idea.description,
-                db_idea.ai_refined_pitch or db_idea.description
-            )
-            logger.info(f"Market insights generated successfully for idea {idea_id}")
-        except Exception as e:
-            logger.error(f"Market insights failed for idea {idea_id}: {e}")
+                db_idea.ai_refined_pitch or db_idea.description,
+                refresh=force_regenerate
+            ),
+            ai_service.generate_risk_assessment(idea_data, refresh=force_regenerate),
+            ai_service.generate_implementation_roadmap(idea_data, refresh=force_regenerate),
+            return_exceptions=True
+        )
+        
+        if isinstance(market_insights, Exception):
+            logger.error(f"Market insights failed for idea {idea_id}: {market_insights}")
             market_insights = f"**Market Analysis for {db_idea.title}**\n\nMarket analysis temporarily unavailable. Please try again later."
             is_ai_generated = False
         
-        # Generate risk assessment with error handling
-        try:
-            logger.info(f"Generating risk assessment for idea {idea_id}")
-            risk_assessment = await ai_service.generate_risk_assessment(idea_data)
-            logger.info(f"Risk assessment generated successfully for idea {idea_id}")
-        except Exception as e:
-            logger.error(f"Risk assessment failed for idea {idea_id}: {e}")
+        if isinstance(risk_assessment, Exception):
+            logger.error(f"Risk assessment failed for idea {idea_id}: {risk_assessment}")
             risk_assessment = f"**Risk Assessment for {db_idea.title}**\n\nRisk analysis temporarily unavailable. Please try again later."
             is_ai_generated = False
         
-        # Generate implementation roadmap with error handling
-        try:
-            logger.info(f"Generating implementation roadmap for idea {idea_id}")
-            implementation_roadmap = await ai_service.generate_implementation_roadmap(idea_data)
-            logger.info(f"Implementation roadmap generated successfully for idea {idea_id}")
-        except Exception as e:
-            logger.error(f"Implementation roadmap failed for idea {idea_id}: {e}")
+        if isinstance(implementation_roadmap, Exception):
+            logger.error(f"Implementation roadmap failed for idea {idea_id}: {implementation_roadmap}")
             implementation_roadmap = f"**Implementation Roadmap for {db_idea.title}**\n\nImplementation planning temporarily unavailable. Please try again later."
             is_ai_generated = False
         
@@ -520,6 +611,123 @@ async def get_idea_insights(
             detail=f"Failed to generate AI insights: {str(e)}"
         )
 
+@router.post("/{idea_id}/analyze", response_model=InsightSummary)
+async def analyze_idea(
+    idea_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Run the full AI pipeline and save the refined pitch, scores and insights"""
+    db_idea = db.query(Idea).filter(
+        Idea.id == idea_id,
+        Idea.created_by == current_user.id
+    ).first()
+    
+    if not db_idea:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Idea not found"
+        )
+    
+    try:
+        from ..services.ai_service import ai_service
+        
+        logger.info(f"Full AI analysis started for idea {idea_id}")
+        
+        analysis = await ai_service.analyze_idea_full(
+            db_idea.title,
+            db_idea.description,
+            db_idea.development_stage.value
+        )
+        
+        db_idea.ai_refined_pitch = analysis["ai_refined_pitch"]
+        db_idea.market_potential = analysis["market_potential"]
+        db_idea.technical_complexity = analysis["technical_complexity"]
+        db_idea.resource_requirements = analysis["resource_requirements"]
+        db_idea.ai_validated = True
+        
+        insights = db.query(IdeaInsight).filter(IdeaInsight.idea_id == idea_id).first()
+        if insights:
+            insights.generation_version += 1
+            insights.updated_at = datetime.now()
+        else:
+            insights = IdeaInsight(idea_id=idea_id, generation_version=1)
+            db.add(insights)
+        
+        insights.market_insights = analysis["market_insights"]
+        insights.risk_assessment = analysis["risk_assessment"]
+        insights.implementation_roadmap = analysis["implementation_roadmap"]
+        insights.is_ai_generated = True
+        
+        db.commit()
+        db.refresh(insights)
+        
+        logger.info(f"✅ Full AI analysis completed for idea {idea_id}")
+        
+        return InsightSummary(
+            idea_id=idea_id,
+            idea_title=db_idea.title,
+            market_insights=insights.market_insights,
+            risk_assessment=insights.risk_assessment,
+            implementation_roadmap=insights.implementation_roadmap,
+            is_ai_generated=insights.is_ai_generated,
+            generation_version=insights.generation_version,
+            generated_at=insights.created_at.isoformat(),
+            last_updated=insights.updated_at.isoformat(),
+            title_optimization=analysis["title_optimization"]
+        )
+        
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Full AI analysis failed for idea {idea_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"AI analysis failed: {str(e)}"
+        )
+
+@router.get("/{idea_id}/stream/{section}")
+async def stream_idea_section(
+    idea_id: int,
+    section: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream a single AI analysis section as it is generated (not saved)"""
+    from ..services.ai_service import ai_service, STREAMABLE_SECTIONS
+    
+    if section not in STREAMABLE_SECTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown section. Available: {', '.join(STREAMABLE_SECTIONS)}"
+        )
+    
+    db_idea = db.query(Idea).filter(
+        Idea.id == idea_id,
+        Idea.created_by == current_user.id
+    ).first()
+    
+    if not db_idea:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Idea not found"
+        )
+    
+    idea_data = {
+        "title": db_idea.title,
+        "description": db_idea.description,
+        "ai_refined_pitch": db_idea.ai_refined_pitch,
+        "development_stage": db_idea.development_stage.value,
+        "market_potential": float(db_idea.market_potential or 5.0),
+        "technical_complexity": float(db_idea.technical_complexity or 5.0),
+        "resource_requirements": float(db_idea.resource_requirements or 5.0)
+    }
+    
+    logger.info(f"Streaming {section} for idea {idea_id}")
+    return StreamingResponse(
+        ai_service.stream_section(section, idea_data),
+        media_type="text/plain; charset=utf-8"
+    )
+
 @router.delete("/{idea_id}/insights")
 async def delete_idea_insights(
     idea_id: int,
@@ -19,6 +19,10 @@ class IdeaCreate(IdeaBase):
     """Schema for creating a new idea"""
     pass
 
+class IdeaBulkCreate(BaseModel):
+    """Schema for creating several ideas in one request"""
+    items: List[IdeaCreate] = Field(..., min_length=1, max_length=50)
+
 class IdeaUpdate(BaseModel):
     """Schema for updating an existing idea"""
     title: Optional[str] = Field(None, min_length=1, max_length=200)
@@ -26,3 +26,4 @@ class InsightSummary(BaseModel):
     generation_version: int
     generated_at: str
     last_updated: str
+    title_optimization: Optional[str] = None
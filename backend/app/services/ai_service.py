@@ -1,30 +1,94 @@
 import google.generativeai as genai
+import orjson
+from google.api_core import exceptions as google_exceptions
 from typing import Dict, Tuple, Optional
+from typing_extensions import TypedDict
+from collections import OrderedDict, deque
 import os
 import asyncio
-import json
+import hashlib
 import logging
+import random
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-class GeminiAIService:
-    def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            logger.error("GEMINI_API_KEY not found in environment variables")
-            raise ValueError("GEMINI_API_KEY is required")
-        
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')  # Updated to latest model
-        self.prompts_used = []  # Track prompts for documentation
-        
-    async def refine_idea(self, title: str, description: str, stage: str) -> str:
-        """
-        AI Prompt #1: Business Idea Refinement
-        Context: Transform user's raw idea into professional, compelling pitch
-        """
-        prompt = f"""You are an expert business consultant and startup advisor with 20+ years of experience helping entrepreneurs develop compelling business pitches.
+# Response cache settings: LRU capacity and per prompt-type TTLs (seconds)
+_CACHE_MAX_ENTRIES = 4096
+_CACHE_TTLS = {
+    "refinement": 3600,
+    "feasibility": 3600,
+    "market": 1800,
+    "risk": 3600,
+    "roadmap": 3600,
+    "title": 86400,
+}
+
+# Maximum number of ideas scored in a single batched feasibility request
+_BATCH_FEASIBILITY_SIZE = 20
+
+# Free-text sections shorter than this are treated as failed generations
+_MIN_SECTION_CHARS = 50
+
+
+def _clamp_scores(analysis: Dict) -> Tuple[float, float, float]:
+    """Feasibility scores from a parsed response, clamped to 1-10"""
+    return (
+        max(1.0, min(10.0, float(analysis["market_potential"]))),
+        max(1.0, min(10.0, float(analysis["technical_complexity"]))),
+        max(1.0, min(10.0, float(analysis["resource_requirements"])))
+    )
+
+
+def _parse_scores(text: str) -> Tuple[float, float, float]:
+    """Parse a feasibility JSON response"""
+    return _clamp_scores(orjson.loads(text))
+
+
+def _parse_section(text: str) -> str:
+    """Accept a free-text section only if it is long enough to be a real answer"""
+    result = text.strip()
+    if len(result) < _MIN_SECTION_CHARS:
+        raise ValueError(f"short or empty response ({len(result)} chars)")
+    return result
+
+# Free-text sections that can be streamed to the client
+STREAMABLE_SECTIONS = ("refinement", "market", "risk", "roadmap", "title")
+
+
+class FeasibilityAnalysis(TypedDict):
+    """Reasoning behind each feasibility score"""
+    market_reasoning: str
+    technical_reasoning: str
+    resource_reasoning: str
+
+
+class FeasibilityResponse(TypedDict):
+    """Response schema for the feasibility scoring prompt"""
+    market_potential: float
+    technical_complexity: float
+    resource_requirements: float
+    analysis: FeasibilityAnalysis
+
+
+class FeasibilityScores(TypedDict):
+    """Per-idea entry in the batched feasibility response"""
+    market_potential: float
+    technical_complexity: float
+    resource_requirements: float
+
+
+class RefineAndScoreResponse(TypedDict):
+    """Response schema for the combined refinement + feasibility prompt"""
+    refined_pitch: str
+    market_potential: float
+    technical_complexity: float
+    resource_requirements: float
+
+
+# Prompt templates, built once at import and filled in per call via str.format
+_REFINE_TMPL = """You are an expert business consultant and startup advisor with 20+ years of experience helping entrepreneurs develop compelling business pitches.
 
 Your task: Transform this business idea into a comprehensive, investor-ready pitch with clear structure and professional formatting.
 
@@ -76,41 +140,15 @@ Provide a compelling 2-3 sentence overview of the business opportunity that hook
 
 Use clear headers with ** formatting, bullet points for lists, and structured formatting for maximum readability. Make it investor-ready and professional.
 
-Keep the total response between 600-900 words with clear section breaks and engaging, specific language."""
+Keep the total response between 600-900 words with clear section breaks and engaging, specific language.""".format
 
-        try:
-            self.prompts_used.append({
-                "prompt_type": "idea_refinement",
-                "context": f"Refining idea '{title}' at {stage} stage",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            response = await self._generate_content_async(prompt)
-            refined_content = response.text.strip()
-            
-            # Ensure proper formatting
-            if not refined_content.startswith('**'):
-                refined_content = f"**Enhanced Business Pitch**\n\n{refined_content}"
-            
-            logger.info(f"Successfully refined idea: {title}")
-            return refined_content
-            
-        except Exception as e:
-            logger.error(f"AI refinement error for '{title}': {e}")
-            return self._fallback_refinement(title, description, stage)
-    
-    async def generate_feasibility_analysis(self, idea_data: Dict) -> Tuple[float, float, float]:
-        """
-        AI Prompt #2: Feasibility Scoring Analysis
-        Context: Analyze business feasibility across multiple dimensions
-        """
-        prompt = f"""You are a senior business analyst specializing in startup feasibility assessment with expertise in market analysis, technical evaluation, and resource planning.
+_FEASIBILITY_TMPL = """You are a senior business analyst specializing in startup feasibility assessment with expertise in market analysis, technical evaluation, and resource planning.
 
 BUSINESS IDEA TO ANALYZE:
-Title: {idea_data.get('title', '')}
-Description: {idea_data.get('description', '')}
-Refined Pitch: {idea_data.get('ai_refined_pitch', '')}
-Development Stage: {idea_data.get('development_stage', '')}
+Title: {title}
+Description: {description}
+Refined Pitch: {refined_pitch}
+Development Stage: {stage}
 
 TASK: Provide precise feasibility scores (1.0-10.0 scale) for these dimensions:
 
@@ -144,340 +182,586 @@ Respond ONLY in valid JSON format:
     }}
 }}
 
-Be precise with scores - use decimal places (e.g., 7.3, 8.7) based on careful analysis."""
+Be precise with scores - use decimal places (e.g., 7.3, 8.7) based on careful analysis.""".format
 
-        try:
-            self.prompts_used.append({
-                "prompt_type": "feasibility_analysis",
-                "context": f"Analyzing feasibility for '{idea_data.get('title', 'unknown')}'",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            response = await self._generate_content_async(prompt)
-            response_text = response.text.strip()
-            
-            # Clean response - remove markdown code blocks if present
-            if response_text.startswith("```json"): 
-                response_text = response_text.replace("```json", "").replace("```", "").strip()
-            elif response_text.startswith("```"):
-                response_text = response_text.replace("```","").strip()
-            
-            analysis = json.loads(response_text)
-            
-            # Validate and clamp scores
-            market_score = max(1.0, min(10.0, float(analysis["market_potential"])))
-            technical_score = max(1.0, min(10.0, float(analysis["technical_complexity"])))
-            resource_score = max(1.0, min(10.0, float(analysis["resource_requirements"])))
-            
-            logger.info(f"AI feasibility analysis completed: M:{market_score}, T:{technical_score}, R:{resource_score}")
-            return (market_score, technical_score, resource_score)
-            
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            logger.error(f"JSON parsing error in feasibility analysis: {e}")
-            return await self._fallback_scoring(idea_data)
-        except Exception as e:
-            logger.error(f"AI feasibility analysis error: {e}")
-            return await self._fallback_scoring(idea_data)
-    
-    async def generate_market_insights(self, title: str, description: str, refined_pitch: str = None) -> str:
-        """
-        AI Prompt #3: Comprehensive Market Analysis and Competitive Intelligence
-        Context: Provide detailed market insights and competitive landscape analysis
-        """
-        prompt = f"""You are a senior market research analyst with expertise in competitive intelligence, market sizing, and industry trend analysis.
+_BATCH_FEASIBILITY_TMPL = """You are a senior business analyst specializing in startup feasibility assessment with expertise in market analysis, technical evaluation, and resource planning.
+
+TASK: Provide precise feasibility scores (1.0-10.0 scale, use decimal places) for each of the {count} business ideas below:
+- market_potential (1.0=no market opportunity, 10.0=massive market opportunity)
+- technical_complexity (1.0=very simple to implement, 10.0=extremely complex)
+- resource_requirements (1.0=minimal resources needed, 10.0=massive resources required)
+
+{ideas}
+
+Respond ONLY with a JSON array of exactly {count} objects, in the same order as the ideas above:
+[
+    {{"market_potential": X.X, "technical_complexity": X.X, "resource_requirements": X.X}}
+]""".format
+
+_BATCH_IDEA_TMPL = """IDEA {index}:
+Title: {title}
+Description: {description}
+Development Stage: {stage}""".format
+
+_REFINE_AND_SCORE_TMPL = """You are an expert business consultant and senior startup analyst with 20+ years of experience developing investor-ready pitches and assessing business feasibility.
+
+BUSINESS IDEA:
+Title: {title}
+Description: {description}
+Development Stage: {stage}
+
+TASK 1 - REFINED PITCH: Transform this idea into a comprehensive, investor-ready pitch using these sections with ** headers and bullet points:
+**Executive Summary**, **Problem Statement**, **Solution Overview**, **Market Opportunity**, **Competitive Advantage**, **Business Model**, **Implementation Strategy**, **Market Entry & Growth**
+Keep the pitch between 600-900 words with engaging, specific language.
+
+TASK 2 - FEASIBILITY SCORES: Based on the same idea, provide precise scores (1.0-10.0 scale, use decimal places):
+- market_potential (1.0=no market opportunity, 10.0=massive market opportunity)
+- technical_complexity (1.0=very simple to implement, 10.0=extremely complex)
+- resource_requirements (1.0=minimal resources needed, 10.0=massive resources required)
+
+Respond ONLY in valid JSON format:
+{{
+    "refined_pitch": "The full markdown-formatted pitch",
+    "market_potential": X.X,
+    "technical_complexity": X.X,
+    "resource_requirements": X.X
+}}""".format
+
+_TITLE_TMPL = """You are a branding expert and marketing strategist specializing in startup naming, positioning, and market communication.
+
+CURRENT BUSINESS IDEA:
+Title: {title}
+Description: {description}
+
+Analyze the current title and suggest 3 optimized alternatives that are:
+1. Clear, descriptive, and immediately understandable
+2. Memorable, marketable, and brandable
+3. Professional yet engaging and modern
+4. SEO-friendly and searchable
+5. Differentiated from competitors
+
+For each suggestion, provide:
+- The optimized title
+- Branding rationale and positioning benefits
+- Target audience appeal analysis
+- SEO and marketability advantages
+
+Format your response as:
+
+**Current Title Analysis:**
+[Brief assessment of current title's strengths and weaknesses]
+
+**Optimized Title Options:**
+
+**Option 1:** [Optimized Title]
+*Rationale:* [Detailed explanation of branding strategy, target appeal, and market positioning benefits]
+*Advantages:* [Specific SEO, marketing, and brand benefits]
+
+**Option 2:** [Optimized Title]
+*Rationale:* [Detailed explanation of branding strategy, target appeal, and market positioning benefits]
+*Advantages:* [Specific SEO, marketing, and brand benefits]
+
+**Option 3:** [Optimized Title]
+*Rationale:* [Detailed explanation of branding strategy, target appeal, and market positioning benefits]
+*Advantages:* [Specific SEO, marketing, and brand benefits]
+
+**Recommendation:**
+[Which option you recommend and why, considering market positioning and brand strategy]
+
+Keep total response under 400 words while being specific and actionable.""".format
+
+_MARKET_TMPL = """You are a senior market research analyst with expertise in competitive intelligence and market analysis.
 
 BUSINESS IDEA FOR ANALYSIS:
 Title: {title}
 Description: {description}
-Refined Pitch: {refined_pitch or 'Not available'}
+Refined Pitch: {refined_pitch}
 
 Provide comprehensive market intelligence covering:
 
 **Market Size & Growth Potential**
-- Total Addressable Market (TAM) estimates with data sources
-- Serviceable Addressable Market (SAM) analysis
-- Current market growth rate and 5-year projections
-- Key market drivers and growth catalysts
+- Total Addressable Market (TAM) estimates
+- Market growth rate and projections
+- Key market drivers and opportunities
 
-**Customer Segmentation & Analysis**
-- Primary target customer segments with demographics
-- Customer pain points and unmet needs analysis
-- Buying behavior, decision factors, and price sensitivity
-- Customer acquisition costs and lifetime value estimates
+**Customer Segmentation**
+- Primary target customer segments
+- Customer pain points and needs
+- Buying behavior and decision factors
 
 **Competitive Landscape**
-- Direct competitors and their market share/positioning
-- Indirect competitors and substitute solutions
-- Competitive strengths, weaknesses, and market gaps
-- Opportunities for differentiation and competitive advantage
-
-**Market Trends & Dynamics**
-- Industry trends supporting this business opportunity
-- Technology trends and adoption patterns
-- Regulatory, social, or economic factors impacting the market
-- Emerging opportunities and market shifts
-
-**Go-to-Market Strategy Insights**
-- Recommended market entry approach and timing
-- Optimal pricing strategy and model considerations
-- Distribution channels and partnership opportunities
-- Marketing channels and customer acquisition strategies
-
-**Market Challenges & Barriers**
-- Key market entry barriers and competitive threats
-- Regulatory or compliance challenges
-- Market education and adoption timeline considerations
-- Potential risks and mitigation strategies
-
-Provide specific, actionable insights with concrete examples and data points where possible. Structure with clear headers and bullet points. Total length: 500-700 words."""
+- Direct and indirect competitors
+- Market positioning opportunities
+- Competitive advantages and gaps
 
-        try:
-            self.prompts_used.append({
-                "prompt_type": "comprehensive_market_insights",
-                "context": f"Generating detailed market analysis for '{title}'",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            response = await self._generate_content_async(prompt)
-            return response.text.strip()
-            
-        except Exception as e:
-            logger.error(f"Market insights generation error: {e}")
-            return self._fallback_market_insights(title, description)
-    
-    async def generate_risk_assessment(self, idea_data: Dict) -> str:
-        """
-        AI Prompt #4: Comprehensive Risk Analysis and Mitigation Framework
-        Context: Identify potential risks across all business dimensions and suggest mitigation strategies
-        """
-        prompt = f"""You are a senior risk management consultant specializing in startup risk assessment and mitigation strategy development.
+**Market Trends**
+- Industry trends supporting this opportunity
+- Technology adoption patterns
+- Market timing considerations
+
+**Go-to-Market Strategy**
+- Recommended market entry approach
+- Pricing strategy considerations
+- Distribution and partnership opportunities
+
+**Market Challenges**
+- Key barriers and competitive threats
+- Regulatory or compliance considerations
+- Market education requirements
+
+Provide specific, actionable insights with clear structure. Total length: 400-600 words.""".format
+
+_RISK_TMPL = """You are a senior risk management consultant specializing in startup risk assessment.
 
 BUSINESS IDEA FOR RISK ANALYSIS:
-Title: {idea_data.get('title', '')}
-Description: {idea_data.get('description', '')}
-Refined Pitch: {idea_data.get('ai_refined_pitch', '')}
-Development Stage: {idea_data.get('development_stage', '')}
-Market Potential Score: {idea_data.get('market_potential', 'N/A')}/10
-Technical Complexity Score: {idea_data.get('technical_complexity', 'N/A')}/10
-Resource Requirements Score: {idea_data.get('resource_requirements', 'N/A')}/10
+Title: {title}
+Description: {description}
+Development Stage: {stage}
+Market Potential Score: {market_potential}/10
+Technical Complexity Score: {technical_complexity}/10
 
-Conduct comprehensive risk analysis across all critical business dimensions:
+Conduct comprehensive risk analysis across critical business dimensions:
 
 **Market & Commercial Risks**
-- Customer adoption challenges and market acceptance risks
-- Competitive threats and market saturation concerns
-- Market timing risks and demand volatility
-- Pricing pressure and revenue model viability
-Risk Level: [High/Medium/Low] | Mitigation Strategies: [Specific actions]
+- Customer adoption challenges and market acceptance
+- Competitive threats and market saturation
+- Market timing and demand volatility
+Risk Level: [High/Medium/Low] | Mitigation Strategies
 
 **Technical & Operational Risks**
-- Development challenges and technical feasibility concerns
+- Development challenges and feasibility concerns
 - Technology scalability and performance limitations
-- Integration complexity and system reliability risks
-- Quality control and product delivery challenges
-Risk Level: [High/Medium/Low] | Mitigation Strategies: [Specific actions]
+- Quality control and delivery challenges
+Risk Level: [High/Medium/Low] | Mitigation Strategies
 
 **Financial & Resource Risks**
 - Funding availability and cash flow management
-- Cost overruns and budget control challenges
-- Revenue generation timeline and break-even risks
-- Investment return and profitability concerns
-Risk Level: [High/Medium/Low] | Mitigation Strategies: [Specific actions]
+- Cost overruns and budget control
+- Revenue generation and profitability timeline
+Risk Level: [High/Medium/Low] | Mitigation Strategies
 
 **Team & Execution Risks**
-- Key talent acquisition and retention challenges
+- Talent acquisition and retention
 - Team scaling and management complexity
 - Skills gaps and expertise requirements
-- Leadership and decision-making risks
-Risk Level: [High/Medium/Low] | Mitigation Strategies: [Specific actions]
+Risk Level: [High/Medium/Low] | Mitigation Strategies
 
 **Strategic & External Risks**
-- Regulatory changes and compliance requirements
-- Economic conditions and market disruptions
-- Strategic partnership and vendor dependencies
-- Intellectual property and legal protection risks
-Risk Level: [High/Medium/Low] | Mitigation Strategies: [Specific actions]
-
-**Early Warning Indicators & Monitoring**
-- Key metrics to track for each risk category
-- Warning signs and trigger points
-- Regular review and assessment framework
-- Contingency planning recommendations
+- Regulatory changes and compliance
+- Market disruptions and economic factors
+- Partnership dependencies and vendor risks
+Risk Level: [High/Medium/Low] | Mitigation Strategies
 
-For each risk category, provide specific risk factors, likelihood assessment, potential impact, and actionable mitigation strategies. Total length: 600-800 words."""
+For each category, provide specific risk factors, likelihood, impact, and actionable mitigation strategies. Total length: 400-600 words.""".format
 
-        try:
-            self.prompts_used.append({
-                "prompt_type": "comprehensive_risk_assessment",
-                "context": f"Analyzing business risks for '{idea_data.get('title', 'unknown')}'",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            response = await self._generate_content_async(prompt)
-            return response.text.strip()
-            
-        except Exception as e:
-            logger.error(f"Risk assessment generation error: {e}")
-            return self._fallback_risk_assessment(idea_data)
-    
-    async def generate_implementation_roadmap(self, idea_data: Dict) -> str:
-        """
-        AI Prompt #5: Strategic Implementation Roadmap with Detailed Action Plans
-        Context: Create comprehensive, actionable implementation plan with timelines and milestones
-        """
-        stage = idea_data.get('development_stage', 'concept')
-        
-        prompt = f"""You are a strategic planning consultant specializing in startup execution roadmaps and operational planning.
+_ROADMAP_TMPL = """You are a strategic planning consultant specializing in startup execution roadmaps.
 
 BUSINESS IDEA FOR ROADMAP DEVELOPMENT:
-Title: {idea_data.get('title', '')}
-Description: {idea_data.get('description', '')}
+Title: {title}
+Description: {description}
 Current Stage: {stage}
-Market Potential: {idea_data.get('market_potential', 'N/A')}/10
-Technical Complexity: {idea_data.get('technical_complexity', 'N/A')}/10
-Resource Requirements: {idea_data.get('resource_requirements', 'N/A')}/10
+Market Potential: {market_potential}/10
+Technical Complexity: {technical_complexity}/10
+Resource Requirements: {resource_requirements}/10
 
 Create a comprehensive 12-month strategic implementation roadmap:
 
 **Phase 1: Foundation & Validation (Months 1-3)**
 - Primary objectives and critical deliverables
 - Market validation and customer discovery activities
-- Technical feasibility assessment and prototype development
+- Technical feasibility and prototype development
 - Team building and key hiring priorities
-- Initial funding and resource acquisition
-- Success metrics: [Specific, measurable outcomes]
-- Budget estimate: [Resource requirements]
+- Success metrics and budget requirements
 
 **Phase 2: Development & Iteration (Months 4-6)**
-- Product/service development priorities and milestones
-- Customer feedback integration and iteration cycles
-- Technology infrastructure setup and scaling preparation
-- Marketing strategy development and brand building
-- Partnership development and strategic alliances
-- Success metrics: [Specific, measurable outcomes]
-- Budget estimate: [Resource requirements]
+- Product/service development priorities
+- Customer feedback integration and iterations
+- Technology infrastructure and scaling prep
+- Marketing strategy and brand development
+- Success metrics and resource needs
 
 **Phase 3: Launch Preparation (Months 7-9)**
-- Go-to-market strategy execution and channel development
-- Sales process optimization and team scaling
-- Marketing campaign launch and customer acquisition
-- Operations scaling and quality assurance systems
-- Legal, compliance, and intellectual property protection
-- Success metrics: [Specific, measurable outcomes]
-- Budget estimate: [Resource requirements]
+- Go-to-market strategy execution
+- Sales process and team scaling
+- Marketing campaigns and customer acquisition
+- Operations scaling and quality systems
+- Success metrics and budget requirements
 
 **Phase 4: Market Entry & Growth (Months 10-12)**
-- Official product/service launch and market penetration
-- Customer acquisition scaling and retention optimization
-- Performance monitoring, analytics, and optimization
-- Revenue scaling and profitability pathway
-- Expansion planning and next-phase preparation
-- Success metrics: [Specific, measurable outcomes]
-- Budget estimate: [Resource requirements]
-
-**Critical Success Factors & Dependencies**
+- Product launch and market penetration
+- Customer acquisition scaling and retention
+- Performance monitoring and optimization
+- Revenue scaling and profitability path
+- Success metrics and expansion planning
+
+**Critical Success Factors**
 - Key assumptions and validation requirements
-- Critical path activities and potential bottlenecks
-- Resource optimization strategies and cost management
-- Risk mitigation measures and contingency plans
+- Critical path activities and bottlenecks
+- Resource optimization and cost management
+- Risk mitigation and contingency plans
 
-**Implementation Guidelines**
-- Weekly and monthly milestone tracking
-- Decision points and pivot considerations
-- Stakeholder communication and reporting framework
-- Resource allocation and budget management approach
+Adjust recommendations based on current stage ({stage}). Be specific with timelines, responsibilities, and measurable outcomes. Total length: 500-700 words.""".format
 
-Adjust recommendations based on the current development stage ({stage}). Be specific and actionable with concrete timelines, responsibilities, and measurable outcomes. Total length: 700-900 words."""
+
+class GeminiAIService:
+    def __init__(self):
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            logger.error("GEMINI_API_KEY not found in environment variables")
+            raise ValueError("GEMINI_API_KEY is required")
+        
+        genai.configure(api_key=api_key)
+        # Cap output length up front so long-form prompts stop generating earlier
+        self.model = genai.GenerativeModel(
+            'gemini-2.0-flash-exp',
+            generation_config=genai.GenerationConfig(
+                max_output_tokens=1200,
+                temperature=0.7,
+                top_p=0.95,
+                candidate_count=1
+            )
+        )
+        # Feasibility scoring only returns a small JSON object
+        self._feas_model = genai.GenerativeModel(
+            'gemini-2.0-flash-exp',
+            generation_config=genai.GenerationConfig(
+                max_output_tokens=400,
+                temperature=0.7,
+                candidate_count=1,
+                response_mime_type="application/json",
+                response_schema=FeasibilityResponse
+            )
+        )
+        # Refined pitch and feasibility scores from a single call
+        self._dual_model = genai.GenerativeModel(
+            'gemini-2.0-flash-exp',
+            generation_config=genai.GenerationConfig(
+                max_output_tokens=1600,
+                temperature=0.7,
+                candidate_count=1,
+                response_mime_type="application/json",
+                response_schema=RefineAndScoreResponse
+            )
+        )
+        # Scores for a batch of ideas in one call (scores only, no reasoning)
+        self._batch_feas_model = genai.GenerativeModel(
+            'gemini-2.0-flash-exp',
+            generation_config=genai.GenerationConfig(
+                max_output_tokens=60 * _BATCH_FEASIBILITY_SIZE,
+                temperature=0.7,
+                candidate_count=1,
+                response_mime_type="application/json",
+                response_schema=list[FeasibilityScores]
+            )
+        )
+        self.prompts_used = deque(maxlen=1000)  # Track recent prompts for documentation
+        
+        # Per prompt-type concurrency limits, sized by expected output length
+        self._sems = {
+            "refinement": asyncio.Semaphore(4),
+            "feasibility": asyncio.Semaphore(16),
+            "market": asyncio.Semaphore(8),
+            "risk": asyncio.Semaphore(6),
+            "roadmap": asyncio.Semaphore(4),
+            "title": asyncio.Semaphore(32),
+        }
+        # Global cap on in-flight calls plus a requests-per-minute token bucket
+        self._sem = asyncio.Semaphore(int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")))
+        self._rpm = int(os.getenv("GEMINI_MAX_RPM", "60"))
+        self._tokens = float(self._rpm)
+        self._tokens_updated = time.monotonic()
+        # prompt hash -> (expires_at, response text), kept in LRU order
+        self._cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        
+    async def refine_idea(self, title: str, description: str, stage: str) -> str:
+        """
+        AI Prompt #1: Business Idea Refinement
+        Context: Transform user's raw idea into professional, compelling pitch
+        """
+        prompt = _REFINE_TMPL(
+            title=title,
+            description=description,
+            stage=stage
+        )
 
         try:
-            self.prompts_used.append({
-                "prompt_type": "detailed_implementation_roadmap",
-                "context": f"Creating 12-month roadmap for '{idea_data.get('title', 'unknown')}' at {stage} stage",
-                "timestamp": datetime.now().isoformat()
-            })
+            self._record("idea_refinement", f"Refining idea '{title}' at {stage} stage")
             
-            response = await self._generate_content_async(prompt)
-            return response.text.strip()
+            response_text = await self._cached_generate(prompt, kind="refinement")
+            refined_content = response_text.strip()
+            
+            # Ensure proper formatting
+            if not refined_content.startswith('**'):
+                refined_content = f"**Enhanced Business Pitch**\n\n{refined_content}"
+            
+            logger.info("Successfully refined idea: %s", title)
+            return refined_content
             
         except Exception as e:
-            logger.error(f"Implementation roadmap generation error: {e}")
-            return self._fallback_implementation_roadmap(idea_data)
+            logger.error("AI refinement error for '%s': %s", title, e)
+            return self._fallback_refinement(title, description, stage)
+    
+    async def generate_feasibility_analysis(self, idea_data: Dict) -> Tuple[float, float, float]:
+        """
+        AI Prompt #2: Feasibility Scoring Analysis
+        Context: Analyze business feasibility across multiple dimensions
+        """
+        prompt = _FEASIBILITY_TMPL(
+            title=idea_data.get('title', ''),
+            description=idea_data.get('description', ''),
+            refined_pitch=idea_data.get('ai_refined_pitch', ''),
+            stage=idea_data.get('development_stage', '')
+        )
+
+        try:
+            self._record("feasibility_analysis", f"Analyzing feasibility for '{idea_data.get('title', 'unknown')}'")
+            
+            # Schema-constrained output: the body is plain JSON, no code fences
+            market_score, technical_score, resource_score = await self._cached_generate(
+                prompt, kind="feasibility", model=self._feas_model, parse=_parse_scores
+            )
+            
+            logger.info("AI feasibility analysis completed: M:%s, T:%s, R:%s", market_score, technical_score, resource_score)
+            return (market_score, technical_score, resource_score)
+            
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
+            logger.error("JSON parsing error in feasibility analysis: %s", e)
+            return await self._fallback_scoring(idea_data)
+        except Exception as e:
+            logger.error("AI feasibility analysis error: %s", e)
+            return await self._fallback_scoring(idea_data)
+    
+    async def batch_feasibility(self, ideas: list[Dict]) -> list[Tuple[float, float, float]]:
+        """
+        AI Prompt #2 (batched): Feasibility Scoring for many ideas
+        Context: Score up to _BATCH_FEASIBILITY_SIZE ideas per request instead of one call each
+        """
+        chunks = [ideas[i:i + _BATCH_FEASIBILITY_SIZE] for i in range(0, len(ideas), _BATCH_FEASIBILITY_SIZE)]
+        results = await asyncio.gather(*(self._batch_feasibility_chunk(chunk) for chunk in chunks))
+        return [scores for chunk_scores in results for scores in chunk_scores]
+    
+    async def refine_and_score(self, title: str, description: str, stage: str) -> Tuple[str, Tuple[float, float, float]]:
+        """
+        AI Prompt #1 + #2 combined: Refinement and Feasibility Scoring
+        Context: Produce the investor pitch and feasibility scores from one shared context
+        """
+        prompt = _REFINE_AND_SCORE_TMPL(
+            title=title,
+            description=description,
+            stage=stage
+        )
+
+        try:
+            self._record("idea_refinement_and_feasibility", f"Refining and scoring idea '{title}' at {stage} stage")
+            
+            def parse(text):
+                result = orjson.loads(text)
+                return result["refined_pitch"].strip(), _clamp_scores(result)
+            
+            refined_content, (market_score, technical_score, resource_score) = await self._cached_generate(
+                prompt, kind="refinement", model=self._dual_model, parse=parse
+            )
+            if not refined_content.startswith('**'):
+                refined_content = f"**Enhanced Business Pitch**\n\n{refined_content}"
+            
+            logger.info("Refined and scored idea '%s': M:%s, T:%s, R:%s", title, market_score, technical_score, resource_score)
+            return refined_content, (market_score, technical_score, resource_score)
+            
+        except Exception as e:
+            logger.error("AI refine-and-score error for '%s': %s", title, e)
+            idea_data = {
+                "title": title,
+                "description": description,
+                "development_stage": stage
+            }
+            return (
+                self._fallback_refinement(title, description, stage),
+                await self._fallback_scoring(idea_data)
+            )
     
     async def optimize_idea_title(self, title: str, description: str) -> str:
         """
         AI Prompt #6: Title Optimization for Market Appeal and Brand Positioning
         Context: Optimize idea titles for clarity, market appeal, and brand positioning
         """
-        prompt = f"""You are a branding expert and marketing strategist specializing in startup naming, positioning, and market communication.
-
-CURRENT BUSINESS IDEA:
-Title: {title}
-Description: {description}
-
-Analyze the current title and suggest 3 optimized alternatives that are:
-1. Clear, descriptive, and immediately understandable
-2. Memorable, marketable, and brandable
-3. Professional yet engaging and modern
-4. SEO-friendly and searchable
-5. Differentiated from competitors
-
-For each suggestion, provide:
-- The optimized title
-- Branding rationale and positioning benefits
-- Target audience appeal analysis
-- SEO and marketability advantages
-
-Format your response as:
-
-**Current Title Analysis:**
-[Brief assessment of current title's strengths and weaknesses]
-
-**Optimized Title Options:**
-
-**Option 1:** [Optimized Title]
-*Rationale:* [Detailed explanation of branding strategy, target appeal, and market positioning benefits]
-*Advantages:* [Specific SEO, marketing, and brand benefits]
-
-**Option 2:** [Optimized Title]
-*Rationale:* [Detailed explanation of branding strategy, target appeal, and market positioning benefits]
-*Advantages:* [Specific SEO, marketing, and brand benefits]
-
-**Option 3:** [Optimized Title]
-*Rationale:* [Detailed explanation of branding strategy, target appeal, and market positioning benefits]
-*Advantages:* [Specific SEO, marketing, and brand benefits]
-
-**Recommendation:**
-[Which option you recommend and why, considering market positioning and brand strategy]
-
-Keep total response under 400 words while being specific and actionable."""
+        prompt = _TITLE_TMPL(
+            title=title,
+            description=description
+        )
 
         try:
-            self.prompts_used.append({
-                "prompt_type": "title_optimization_and_branding",
-                "context": f"Optimizing and analyzing title '{title}' for market positioning",
-                "timestamp": datetime.now().isoformat()
-            })
+            self._record("title_optimization_and_branding", f"Optimizing and analyzing title '{title}' for market positioning")
             
-            response = await self._generate_content_async(prompt)
-            return response.text.strip()
+            response_text = await self._cached_generate(prompt, kind="title")
+            return response_text.strip()
             
         except Exception as e:
-            logger.error(f"Title optimization error: {e}")
+            logger.error("Title optimization error: %s", e)
             return self._fallback_title_optimization(title, description)
     
+    async def analyze_idea_full(self, title: str, description: str, stage: str) -> Dict:
+        """
+        Full AI pipeline: refinement, scoring, market, title, risk and roadmap
+        Context: Independent prompts run concurrently; risk and roadmap start once scores are known
+        """
+        async with asyncio.TaskGroup() as tg:
+            refine_task = tg.create_task(self.refine_and_score(title, description, stage))
+            market_task = tg.create_task(self.generate_market_insights(title, description))
+            title_task = tg.create_task(self.optimize_idea_title(title, description))
+            
+            refined_pitch, (market, complexity, resources) = await refine_task
+            idea_data = {
+                "title": title,
+                "description": description,
+                "ai_refined_pitch": refined_pitch,
+                "development_stage": stage,
+                "market_potential": market,
+                "technical_complexity": complexity,
+                "resource_requirements": resources
+            }
+            risk_task = tg.create_task(self.generate_risk_assessment(idea_data))
+            roadmap_task = tg.create_task(self.generate_implementation_roadmap(idea_data))
+        
+        return {
+            "ai_refined_pitch": refined_pitch,
+            "market_potential": market,
+            "technical_complexity": complexity,
+            "resource_requirements": resources,
+            "market_insights": market_task.result(),
+            "title_optimization": title_task.result(),
+            "risk_assessment": risk_task.result(),
+            "implementation_roadmap": roadmap_task.result()
+        }
+    
+    async def stream_section(self, kind: str, idea_data: Dict):
+        """
+        Stream a free-text analysis section as Gemini generates it
+        Context: Lets the API respond from the first token instead of buffering the whole answer
+        """
+        prompt = self._build_prompt(kind, idea_data)
+        key = self._cache_key(prompt, kind)
+        
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        self._record(f"{kind}_stream", f"Streaming {kind} for '{idea_data.get('title', 'unknown')}'")
+        chunks = []
+        try:
+            async for text in self._stream_content(prompt, kind):
+                chunks.append(text)
+                yield text
+        except Exception as e:
+            logger.error("Streaming %s error for '%s': %s", kind, idea_data.get('title'), e)
+            # Only fall back if nothing has been sent yet
+            if not chunks:
+                yield self._fallback_section(kind, idea_data)
+            return
+        
+        # Don't pin a truncated answer in the cache
+        text = "".join(chunks)
+        if len(text.strip()) >= _MIN_SECTION_CHARS:
+            self._cache_put(key, kind, text)
+    
+    async def _batch_feasibility_chunk(self, ideas: list[Dict]) -> list[Tuple[float, float, float]]:
+        """Score one batch of ideas, falling back per idea if the response is unusable"""
+        prompt = _BATCH_FEASIBILITY_TMPL(
+            count=len(ideas),
+            ideas="\n\n".join(
+                _BATCH_IDEA_TMPL(
+                    index=i,
+                    title=idea.get('title', ''),
+                    description=idea.get('description', ''),
+                    stage=idea.get('development_stage', '')
+                )
+                for i, idea in enumerate(ideas, 1)
+            )
+        )
+        
+        try:
+            self._record("batch_feasibility_analysis", f"Analyzing feasibility for {len(ideas)} ideas")
+            
+            def parse(text):
+                analyses = orjson.loads(text)
+                if len(analyses) != len(ideas):
+                    raise ValueError(f"expected {len(ideas)} scores, got {len(analyses)}")
+                return [_clamp_scores(a) for a in analyses]
+            
+            scores = await self._cached_generate(
+                prompt, kind="feasibility", model=self._batch_feas_model, parse=parse
+            )
+            logger.info("AI batch feasibility analysis completed for %d ideas", len(scores))
+            return scores
+            
+        except Exception as e:
+            logger.error("AI batch feasibility analysis error: %s", e)
+            return [await self._fallback_scoring(idea) for idea in ideas]
+    
     def get_prompts_documentation(self) -> list:
         """Return all prompts used for assignment documentation"""
-        return self.prompts_used
+        return [
+            {**entry, "timestamp": datetime.fromtimestamp(entry["timestamp"]).isoformat()}
+            for entry in self.prompts_used
+        ]
+    
+    def _record(self, prompt_type: str, context: str):
+        """Track a prompt for documentation; timestamps are formatted on read"""
+        self.prompts_used.append({
+            "prompt_type": prompt_type,
+            "context": context,
+            "timestamp": time.time()
+        })
+    
+    async def _cached_generate(self, prompt: str, kind: str, model=None, refresh: bool = False, parse=None):
+        """
+        Return the response for a prompt, served from the LRU cache while fresh.
+        If given, parse(text) validates the response and its result is returned;
+        a response it rejects is raised to the caller and never cached.
+        """
+        key = self._cache_key(prompt, kind)
+        
+        cached = None if refresh else self._cache_get(key)
+        if cached is not None:
+            return parse(cached) if parse else cached
+        
+        response = await self._generate_content_async(prompt, kind=kind, model=model)
+        result = parse(response.text) if parse else response.text
+        self._cache_put(key, kind, response.text)
+        return result
+    
+    @staticmethod
+    def _cache_key(prompt: str, kind: str) -> str:
+        """Cache key for a prompt of a given type"""
+        return hashlib.blake2b(f"{kind}:{prompt}".encode(), digest_size=16).hexdigest()
     
-    async def _generate_content_async(self, prompt: str):
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Cached response text if present and not expired"""
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            return cached[1]
+        return None
+    
+    def _cache_put(self, key: str, kind: str, text: str):
+        """Store response text, evicting the least recently used entry when full"""
+        self._cache[key] = (time.monotonic() + _CACHE_TTLS[kind], text)
+        self._cache.move_to_end(key)
+        if len(self._cache) > _CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+    
+    async def _generate_content_async(self, prompt: str, kind: str, model=None):
         """Async wrapper for Gemini content generation with retry logic and rate limiting"""
         max_retries = 3
         base_delay = 2
+        model = model or self.model
         
         for attempt in range(max_retries):
             try:
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, self.model.generate_content, prompt)
+                # Hold the slots only while the call is in flight
+                async with self._sems[kind], self._sem:
+                    await self._acquire_token()
+                    response = await model.generate_content_async(prompt)
                 
                 # Validate response
                 if not response or not response.text:
@@ -487,13 +771,109 @@ Keep total response under 400 words while being specific and actionable."""
                 
             except Exception as e:
                 if attempt == max_retries - 1:
-                    logger.error(f"Gemini API failed after {max_retries} attempts: {e}")
+                    logger.error("Gemini API failed after %s attempts: %s", max_retries, e)
                     raise e
                 
-                delay = base_delay * (2 ** attempt)  # Exponential backoff
-                logger.warning(f"Gemini API attempt {attempt + 1} failed, retrying in {delay}s: {e}")
+                # Honour the server's retry delay on 429s, otherwise exponential backoff
+                # with jitter so concurrent retries don't line up
+                delay = self._retry_delay(e) or base_delay * (2 ** attempt) + random.random() * 0.25
+                logger.warning("Gemini API attempt %s failed, retrying in %.2fs: %s", attempt + 1, delay, e)
                 await asyncio.sleep(delay)
     
+    async def _stream_content(self, prompt: str, kind: str, model=None):
+        """Yield response text chunks from a streaming Gemini call (no retries once started)"""
+        model = model or self.model
+        
+        async with self._sems[kind], self._sem:
+            await self._acquire_token()
+            response = await model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                if chunk.parts:
+                    yield chunk.text
+    
+    def _build_prompt(self, kind: str, idea_data: Dict) -> str:
+        """Render the prompt for a streamable section from idea fields"""
+        title = idea_data.get('title', '')
+        description = idea_data.get('description', '')
+        
+        if kind == "refinement":
+            return _REFINE_TMPL(
+                title=title,
+                description=description,
+                stage=idea_data.get('development_stage', '')
+            )
+        if kind == "market":
+            return _MARKET_TMPL(
+                title=title,
+                description=description,
+                refined_pitch=idea_data.get('ai_refined_pitch') or 'Not available'
+            )
+        if kind == "risk":
+            return _RISK_TMPL(
+                title=title,
+                description=description,
+                stage=idea_data.get('development_stage', ''),
+                market_potential=idea_data.get('market_potential', 'N/A'),
+                technical_complexity=idea_data.get('technical_complexity', 'N/A')
+            )
+        if kind == "roadmap":
+            return _ROADMAP_TMPL(
+                title=title,
+                description=description,
+                stage=idea_data.get('development_stage', 'concept'),
+                market_potential=idea_data.get('market_potential', 'N/A'),
+                technical_complexity=idea_data.get('technical_complexity', 'N/A'),
+                resource_requirements=idea_data.get('resource_requirements', 'N/A')
+            )
+        if kind == "title":
+            return _TITLE_TMPL(title=title, description=description)
+        
+        raise ValueError(f"Unknown section: {kind}")
+    
+    def _fallback_section(self, kind: str, idea_data: Dict) -> str:
+        """Fallback text for a streamable section"""
+        title = idea_data.get('title', '')
+        description = idea_data.get('description', '')
+        
+        if kind == "refinement":
+            return self._fallback_refinement(title, description, idea_data.get('development_stage', 'concept'))
+        if kind == "market":
+            return self._fallback_market_insights(title, description)
+        if kind == "risk":
+            return self._fallback_risk_assessment(idea_data)
+        if kind == "roadmap":
+            return self._fallback_implementation_roadmap(idea_data)
+        return self._fallback_title_optimization(title, description)
+    
+    async def _acquire_token(self):
+        """Wait for a token from the requests-per-minute bucket"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._rpm, self._tokens + (now - self._tokens_updated) * self._rpm / 60)
+            self._tokens_updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) * 60 / self._rpm)
+    
+    @staticmethod
+    def _retry_delay(exc: Exception) -> Optional[float]:
+        """Extract the server-suggested retry delay from a 429 error, if present"""
+        if not isinstance(exc, google_exceptions.TooManyRequests):
+            return None
+        
+        for detail in getattr(exc, "details", None) or []:
+            retry_delay = getattr(detail, "retry_delay", None)
+            if retry_delay is None:
+                continue
+            if hasattr(retry_delay, "total_seconds"):
+                return retry_delay.total_seconds()
+            return retry_delay.seconds + retry_delay.nanos / 1e9
+        
+        return None
+    
     def _fallback_refinement(self, title: str, description: str, stage: str) -> str:
         """Enhanced fallback refinement when AI fails"""
         return f"""**{title}** - Professional Business Concept
@@ -559,7 +939,7 @@ This innovative concept is currently in the {stage} stage, representing a compel
         technical = max(1.0, min(10.0, base_tech))
         resource = max(1.0, min(10.0, base_resource))
         
-        logger.info(f"Fallback scoring applied: M:{market}, T:{technical}, R:{resource}")
+        logger.info("Fallback scoring applied: M:%s, T:%s, R:%s", market, technical, resource)
         return (market, technical, resource)
     
     def _fallback_market_insights(self, title: str, description: str) -> str:
@@ -627,7 +1007,7 @@ Based on the business concept, this solution addresses a clear market need with
 *Note: This is a general risk overview. Full AI risk analysis temporarily unavailable - please try again later for comprehensive risk assessment.*"""
     # ... existing methods ...
     
-    async def generate_market_insights(self, title: str, description: str, refined_pitch: str = None) -> str:
+    async def generate_market_insights(self, title: str, description: str, refined_pitch: str = None, refresh: bool = False) -> str:
         """
         AI Prompt #3: Comprehensive Market Analysis and Competitive Intelligence
         Context: Provide detailed market insights and competitive landscape analysis
@@ -637,69 +1017,25 @@ Based on the business concept, this solution addresses a clear market need with
             logger.warning("Missing title or description for market insights")
             return self._fallback_market_insights(title or "Unknown", description or "No description")
         
-        prompt = f"""You are a senior market research analyst with expertise in competitive intelligence and market analysis.
-
-BUSINESS IDEA FOR ANALYSIS:
-Title: {title}
-Description: {description}
-Refined Pitch: {refined_pitch or 'Not available'}
-
-Provide comprehensive market intelligence covering:
-
-**Market Size & Growth Potential**
-- Total Addressable Market (TAM) estimates
-- Market growth rate and projections
-- Key market drivers and opportunities
-
-**Customer Segmentation**
-- Primary target customer segments
-- Customer pain points and needs
-- Buying behavior and decision factors
-
-**Competitive Landscape**
-- Direct and indirect competitors
-- Market positioning opportunities
-- Competitive advantages and gaps
-
-**Market Trends**
-- Industry trends supporting this opportunity
-- Technology adoption patterns
-- Market timing considerations
-
-**Go-to-Market Strategy**
-- Recommended market entry approach
-- Pricing strategy considerations
-- Distribution and partnership opportunities
-
-**Market Challenges**
-- Key barriers and competitive threats
-- Regulatory or compliance considerations
-- Market education requirements
-
-Provide specific, actionable insights with clear structure. Total length: 400-600 words."""
+        prompt = _MARKET_TMPL(
+            title=title,
+            description=description,
+            refined_pitch=refined_pitch or 'Not available'
+        )
 
         try:
-            self.prompts_used.append({
-                "prompt_type": "comprehensive_market_insights",
-                "context": f"Generating detailed market analysis for '{title}'",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            response = await self._generate_content_async(prompt)
-            result = response.text.strip()
+            self._record("comprehensive_market_insights", f"Generating detailed market analysis for '{title}'")
             
-            if not result or len(result) < 50:
-                logger.warning(f"Short or empty market insights response for '{title}'")
-                return self._fallback_market_insights(title, description)
+            result = await self._cached_generate(prompt, kind="market", refresh=refresh, parse=_parse_section)
             
-            logger.info(f"Market insights generated successfully for '{title}' ({len(result)} chars)")
+            logger.info("Market insights generated successfully for '%s' (%s chars)", title, len(result))
             return result
             
         except Exception as e:
-            logger.error(f"Market insights generation error for '{title}': {e}")
+            logger.error("Market insights generation error for '%s': %s", title, e)
             return self._fallback_market_insights(title, description)
     
-    async def generate_risk_assessment(self, idea_data: Dict) -> str:
+    async def generate_risk_assessment(self, idea_data: Dict, refresh: bool = False) -> str:
         """
         AI Prompt #4: Comprehensive Risk Analysis and Mitigation Framework
         """
@@ -709,71 +1045,27 @@ Provide specific, actionable insights with clear structure. Total length: 400-60
             return self._fallback_risk_assessment(idea_data or {})
         
         title = idea_data.get('title', 'Unknown Idea')
-        prompt = f"""You are a senior risk management consultant specializing in startup risk assessment.
-
-BUSINESS IDEA FOR RISK ANALYSIS:
-Title: {idea_data.get('title', '')}
-Description: {idea_data.get('description', '')}
-Development Stage: {idea_data.get('development_stage', '')}
-Market Potential Score: {idea_data.get('market_potential', 'N/A')}/10
-Technical Complexity Score: {idea_data.get('technical_complexity', 'N/A')}/10
-
-Conduct comprehensive risk analysis across critical business dimensions:
-
-**Market & Commercial Risks**
-- Customer adoption challenges and market acceptance
-- Competitive threats and market saturation
-- Market timing and demand volatility
-Risk Level: [High/Medium/Low] | Mitigation Strategies
-
-**Technical & Operational Risks**
-- Development challenges and feasibility concerns
-- Technology scalability and performance limitations
-- Quality control and delivery challenges
-Risk Level: [High/Medium/Low] | Mitigation Strategies
-
-**Financial & Resource Risks**
-- Funding availability and cash flow management
-- Cost overruns and budget control
-- Revenue generation and profitability timeline
-Risk Level: [High/Medium/Low] | Mitigation Strategies
-
-**Team & Execution Risks**
-- Talent acquisition and retention
-- Team scaling and management complexity
-- Skills gaps and expertise requirements
-Risk Level: [High/Medium/Low] | Mitigation Strategies
-
-**Strategic & External Risks**
-- Regulatory changes and compliance
-- Market disruptions and economic factors
-- Partnership dependencies and vendor risks
-Risk Level: [High/Medium/Low] | Mitigation Strategies
-
-For each category, provide specific risk factors, likelihood, impact, and actionable mitigation strategies. Total length: 400-600 words."""
+        prompt = _RISK_TMPL(
+            title=idea_data.get('title', ''),
+            description=idea_data.get('description', ''),
+            stage=idea_data.get('development_stage', ''),
+            market_potential=idea_data.get('market_potential', 'N/A'),
+            technical_complexity=idea_data.get('technical_complexity', 'N/A')
+        )
 
         try:
-            self.prompts_used.append({
-                "prompt_type": "comprehensive_risk_assessment",
-                "context": f"Analyzing business risks for '{title}'",
-                "timestamp": datetime.now().isoformat()
-            })
+            self._record("comprehensive_risk_assessment", f"Analyzing business risks for '{title}'")
             
-            response = await self._generate_content_async(prompt)
-            result = response.text.strip()
+            result = await self._cached_generate(prompt, kind="risk", refresh=refresh, parse=_parse_section)
             
-            if not result or len(result) < 50:
-                logger.warning(f"Short or empty risk assessment response for '{title}'")
-                return self._fallback_risk_assessment(idea_data)
-            
-            logger.info(f"Risk assessment generated successfully for '{title}' ({len(result)} chars)")
+            logger.info("Risk assessment generated successfully for '%s' (%s chars)", title, len(result))
             return result
             
         except Exception as e:
-            logger.error(f"Risk assessment generation error for '{title}': {e}")
+            logger.error("Risk assessment generation error for '%s': %s", title, e)
             return self._fallback_risk_assessment(idea_data)
     
-    async def generate_implementation_roadmap(self, idea_data: Dict) -> str:
+    async def generate_implementation_roadmap(self, idea_data: Dict, refresh: bool = False) -> str:
         """
         AI Prompt #5: Strategic Implementation Roadmap with Detailed Action Plans
         """
@@ -785,73 +1077,25 @@ For each category, provide specific risk factors, likelihood, impact, and action
         title = idea_data.get('title', 'Unknown Idea')
         stage = idea_data.get('development_stage', 'concept')
         
-        prompt = f"""You are a strategic planning consultant specializing in startup execution roadmaps.
-
-BUSINESS IDEA FOR ROADMAP DEVELOPMENT:
-Title: {idea_data.get('title', '')}
-Description: {idea_data.get('description', '')}
-Current Stage: {stage}
-Market Potential: {idea_data.get('market_potential', 'N/A')}/10
-Technical Complexity: {idea_data.get('technical_complexity', 'N/A')}/10
-Resource Requirements: {idea_data.get('resource_requirements', 'N/A')}/10
-
-Create a comprehensive 12-month strategic implementation roadmap:
-
-**Phase 1: Foundation & Validation (Months 1-3)**
-- Primary objectives and critical deliverables
-- Market validation and customer discovery activities
-- Technical feasibility and prototype development
-- Team building and key hiring priorities
-- Success metrics and budget requirements
-
-**Phase 2: Development & Iteration (Months 4-6)**
-- Product/service development priorities
-- Customer feedback integration and iterations
-- Technology infrastructure and scaling prep
-- Marketing strategy and brand development
-- Success metrics and resource needs
-
-**Phase 3: Launch Preparation (Months 7-9)**
-- Go-to-market strategy execution
-- Sales process and team scaling
-- Marketing campaigns and customer acquisition
-- Operations scaling and quality systems
-- Success metrics and budget requirements
-
-**Phase 4: Market Entry & Growth (Months 10-12)**
-- Product launch and market penetration
-- Customer acquisition scaling and retention
-- Performance monitoring and optimization
-- Revenue scaling and profitability path
-- Success metrics and expansion planning
-
-**Critical Success Factors**
-- Key assumptions and validation requirements
-- Critical path activities and bottlenecks
-- Resource optimization and cost management
-- Risk mitigation and contingency plans
-
-Adjust recommendations based on current stage ({stage}). Be specific with timelines, responsibilities, and measurable outcomes. Total length: 500-700 words."""
+        prompt = _ROADMAP_TMPL(
+            title=idea_data.get('title', ''),
+            description=idea_data.get('description', ''),
+            stage=stage,
+            market_potential=idea_data.get('market_potential', 'N/A'),
+            technical_complexity=idea_data.get('technical_complexity', 'N/A'),
+            resource_requirements=idea_data.get('resource_requirements', 'N/A')
+        )
 
         try:
-            self.prompts_used.append({
-                "prompt_type": "detailed_implementation_roadmap",
-                "context": f"Creating 12-month roadmap for '{title}' at {stage} stage",
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            response = await self._generate_content_async(prompt)
-            result = response.text.strip()
+            self._record("detailed_implementation_roadmap", f"Creating 12-month roadmap for '{title}' at {stage} stage")
             
-            if not result or len(result) < 50:
-                logger.warning(f"Short or empty roadmap response for '{title}'")
-                return self._fallback_implementation_roadmap(idea_data)
+            result = await self._cached_generate(prompt, kind="roadmap", refresh=refresh, parse=_parse_section)
             
-            logger.info(f"Implementation roadmap generated successfully for '{title}' ({len(result)} chars)")
+            logger.info("Implementation roadmap generated successfully for '%s' (%s chars)", title, len(result))
             return result
             
         except Exception as e:
-            logger.error(f"Implementation roadmap generation error for '{title}': {e}")
+            logger.error("Implementation roadmap generation error for '%s': %s", title, e)
             return self._fallback_implementation_roadmap(idea_data)
 
     # Enhanced fallback methods
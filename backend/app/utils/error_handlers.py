@@ -2,21 +2,33 @@
 Enhanced error handling for production deployment
 """
 
+import functools
 import logging
 import traceback
-from typing import Dict, Any, Optional
+import types
+from datetime import datetime, timezone
+from typing import Dict, Any, Mapping, Optional
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import ValidationError
 
 from ..config import settings
-from .logging import ErrorLogger
+from .logging import ErrorLogger, _Lazy
 
 logger = logging.getLogger(__name__)
 
+# Shared empty details mapping; read-only so no error can leak keys into another
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+# Environment is fixed for the process lifetime
+_IS_PRODUCTION = settings.is_production
+
+# Pre-built error codes for the common HTTP statuses
+_HTTP_CODES = {c: f"HTTP_{c}" for c in (400, 401, 403, 404, 405, 409, 422, 429, 500, 502, 503, 504)}
+
 
 class APIError(Exception):
     """Base API error class"""
@@ -26,12 +38,13 @@ class APIError(Exception):
         message: str,
         status_code: int = 500,
         error_code: str = None,
-        details: Dict[str, Any] = None
+        details: Mapping[str, Any] = None
     ):
         self.message = message
         self.status_code = status_code
         self.error_code = error_code or f"API_ERROR_{status_code}"
-        self.details = details or {}
+        # Read-only: an error without details shares the empty _EMPTY mapping
+        self.details: Mapping[str, Any] = details if details else _EMPTY
         super().__init__(self.message)
 
 
@@ -117,16 +130,19 @@ class ExternalServiceError(APIError):
 
 
 def get_client_ip(request: Request) -> str:
-    """Extract client IP from request"""
+    """Extract client IP from request (memoized on request.state)"""
+    ip = getattr(request.state, "_client_ip", None)
+    if ip:
+        return ip
+    
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
+        ip = forwarded_for.split(",")[0].strip()
+    else:
+        ip = request.headers.get("X-Real-IP") or (request.client.host if request.client else "unknown")
     
-    return request.client.host if request.client else "unknown"
+    request.state._client_ip = ip
+    return ip
 
 
 def create_error_response(
@@ -141,7 +157,7 @@ def create_error_response(
     error_response = {
         "error": {
             "message": message,
-            "code": error_code or f"HTTP_{status_code}",
+            "code": error_code or _HTTP_CODES.get(status_code) or f"HTTP_{status_code}",
             "status_code": status_code,
         }
     }
@@ -152,12 +168,10 @@ def create_error_response(
     if request_id:
         error_response["error"]["request_id"] = request_id
     
-    if not settings.is_production:
-        error_response["error"]["timestamp"] = logger.handlers[0].formatter.formatTime(
-            logging.LogRecord("", 0, "", 0, "", (), None)
-        )
+    if not _IS_PRODUCTION:
+        error_response["error"]["timestamp"] = datetime.now(timezone.utc).isoformat()
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content=error_response
     )
@@ -165,20 +179,19 @@ def create_error_response(
 
 async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
     """Handle custom API errors"""
-    client_ip = get_client_ip(request)
-    
-    # Log the error
-    logger.error(
-        f"API Error: {exc.error_code} - {exc.message}",
-        extra={
-            "error_code": exc.error_code,
-            "status_code": exc.status_code,
-            "client_ip": client_ip,
-            "endpoint": str(request.url.path),
-            "method": request.method,
-            "details": exc.details
-        }
-    )
+    # Log the error (unless handle_errors already logged the underlying exception)
+    if not getattr(exc, "_logged", False):
+        logger.error(
+            f"API Error: {exc.error_code} - {exc.message}",
+            extra={
+                "error_code": exc.error_code,
+                "status_code": exc.status_code,
+                "client_ip": get_client_ip(request),
+                "endpoint": str(request.url.path),
+                "method": request.method,
+                "details": exc.details
+            }
+        )
     
     return create_error_response(
         status_code=exc.status_code,
@@ -206,7 +219,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     return create_error_response(
         status_code=exc.status_code,
         message=exc.detail,
-        error_code=f"HTTP_{exc.status_code}"
+        error_code=_HTTP_CODES.get(exc.status_code) or f"HTTP_{exc.status_code}"
     )
 
 
@@ -215,13 +228,10 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     client_ip = get_client_ip(request)
     
     # Extract validation errors
-    validation_errors = []
-    for error in exc.errors():
-        validation_errors.append({
-            "field": ".".join(str(x) for x in error["loc"]),
-            "message": error["msg"],
-            "type": error["type"]
-        })
+    validation_errors = [
+        {"field": ".".join(map(str, e["loc"])), "message": e["msg"], "type": e["type"]}
+        for e in exc.errors()
+    ]
     
     # Log the error
     logger.warning(
@@ -248,11 +258,11 @@ async def database_exception_handler(request: Request, exc: SQLAlchemyError) ->
     
     # Log the database error
     ErrorLogger.log_database_error(
-        operation=f"{request.method} {request.url.path}",
+        operation=_Lazy(lambda: f"{request.method} {request.url.path}"),
         error=exc
     )
     
-    if settings.is_production:
+    if _IS_PRODUCTION:
         # Don't expose database details in production
         message = "Database operation failed"
         details = None
@@ -282,16 +292,18 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
         }
     )
     
-    if settings.is_production:
+    if _IS_PRODUCTION:
         # Don't expose internal details in production
         message = "Internal server error"
         details = None
     else:
         message = f"Internal error: {str(exc)}"
-        details = {
-            "error_type": type(exc).__name__,
-            "traceback": traceback.format_exc()
-        }
+        details = {"error_type": exc.__class__.__name__}
+        # The traceback is already logged once by ErrorLogger; only echo it back when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            details["traceback"] = "".join(
+                traceback.format_exception(exc.__class__, exc, exc.__traceback__)
+            )
     
     return create_error_response(
         status_code=500,
@@ -352,6 +364,7 @@ class ErrorContext:
 def handle_errors(operation: str = None):
     """Decorator for automatic error handling"""
     def decorator(func):
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             try:
                 return await func(*args, **kwargs)
@@ -359,16 +372,15 @@ def handle_errors(operation: str = None):
                 # Re-raise API errors as they're already handled
                 raise
             except Exception as e:
-                # Log and convert to API error
+                # Log once here and mark the wrapped error so api_error_handler doesn't log it again
                 ErrorLogger.log_exception(
                     exception=e,
                     context={"operation": operation or func.__name__}
                 )
                 
-                if settings.is_production:
-                    raise APIError("Operation failed")
-                else:
-                    raise APIError(f"Operation failed: {str(e)}")
+                error = APIError("Operation failed" if _IS_PRODUCTION else f"Operation failed: {str(e)}")
+                error._logged = True
+                raise error from e
         
         return wrapper
     return decorator
\ No newline at end of file
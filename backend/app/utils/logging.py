@@ -4,21 +4,79 @@ Enhanced logging configuration for production deployment
 
 import os
 import sys
+import atexit
+import queue
 import logging
 import logging.handlers
-from datetime import datetime
+import time
 from typing import Dict, Any
 import json
 from ..config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is pinned in requirements.txt
+    orjson = None
+
+
+def _dumps(log_entry: Dict[str, Any]) -> bytes:
+    """Serialize a log entry to UTF-8 JSON, preferring orjson"""
+    if orjson is not None:
+        return orjson.dumps(log_entry, default=str)
+    return json.dumps(log_entry, default=str).encode()
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recent record, swapped atomically
+_ts_prefix = (None, "")
+
+
+def _iso_timestamp(created: float) -> str:
+    """Format an epoch timestamp as ISO-8601 UTC, reusing the prefix within the same second"""
+    global _ts_prefix
+    sec = int(created)
+    last_sec, prefix = _ts_prefix
+    if sec != last_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_prefix = (sec, prefix)
+    return f"{prefix}.{int((created - sec) * 1e6):06d}Z"
+
+
+class _Lazy:
+    """Log argument whose text is only built if a handler formats the record"""
+    __slots__ = ('fn',)
+    
+    def __init__(self, fn):
+        self.fn = fn
+    
+    def __str__(self) -> str:
+        return self.fn()
+
+
+# Extra record attributes copied into JSON log entries (ordered for stable output)
+_EXTRA_KEYS = ('user_id', 'request_id', 'client_ip', 'endpoint', 'method', 'status_code', 'response_time')
+
 
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging"""
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
+        text = record.__dict__.get('_json')
+        if text is None:
+            text = record._json = self.format_bytes(record).decode()
+        return text
+    
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format log record as UTF-8 encoded JSON (used by the binary file handlers)"""
+        # In production the same record reaches up to three JSON handlers
+        # (console, app.log, error.log); encode it only once
+        rd = record.__dict__
+        cached = rd.get('_json_bytes')
+        if cached is not None:
+            return cached
+        
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -28,36 +86,20 @@ class JSONFormatter(logging.Formatter):
         }
         
         # Add extra fields if present
-        if hasattr(record, 'user_id'):
-            log_entry['user_id'] = record.user_id
-        
-        if hasattr(record, 'request_id'):
-            log_entry['request_id'] = record.request_id
-        
-        if hasattr(record, 'client_ip'):
-            log_entry['client_ip'] = record.client_ip
-        
-        if hasattr(record, 'endpoint'):
-            log_entry['endpoint'] = record.endpoint
-        
-        if hasattr(record, 'method'):
-            log_entry['method'] = record.method
-        
-        if hasattr(record, 'status_code'):
-            log_entry['status_code'] = record.status_code
-        
-        if hasattr(record, 'response_time'):
-            log_entry['response_time'] = record.response_time
+        log_entry.update({k: rd[k] for k in _EXTRA_KEYS if k in rd})
         
-        # Add exception info if present
+        # Add exception info if present (cached on the record like logging.Formatter does)
         if record.exc_info:
-            log_entry['exception'] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_entry['exception'] = record.exc_text
         
         # Add stack trace if present
         if record.stack_info:
             log_entry['stack_trace'] = record.stack_info
         
-        return json.dumps(log_entry)
+        record._json_bytes = _dumps(log_entry)
+        return record._json_bytes
 
 
 class ColoredFormatter(logging.Formatter):
@@ -72,25 +114,111 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
-    def format(self, record: logging.LogRecord) -> str:
-        """Format log record with colors"""
-        if not sys.stdout.isatty():
-            # No colors for non-terminal output
-            return super().format(record)
-        
-        color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{color}{record.levelname}{self.RESET}"
-        
-        return super().format(record)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # No colors for non-terminal output; decided once rather than per record
+        self._is_tty = sys.stdout.isatty()
+        self._level_strs = {
+            getattr(logging, name): f"{color}{name}{self.RESET}"
+            for name, color in self.COLORS.items()
+        }
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """Format log record with colors, without mutating the shared record"""
+        colored = self._level_strs.get(record.levelno) if self._is_tty else None
+        if colored is None:
+            return super().formatMessage(record)
+        return self._fmt % {**record.__dict__, 'levelname': colored}
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for an in-process listener that keeps exc_info for JSONFormatter"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now so mutable arguments are captured at call time
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Binary-mode RotatingFileHandler that buffers writes instead of flushing every record"""
+    
+    terminator = b'\n'
+    
+    def _open(self):
+        # Binary mode: JSON is written as the bytes orjson produced, with no decode/encode round trip
+        stream = open(self.baseFilename, self.mode + 'b', buffering=65536)
+        self._size = os.path.getsize(self.baseFilename)
+        return stream
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            formatter = self.formatter
+            if isinstance(formatter, JSONFormatter):
+                msg = formatter.format_bytes(record) + self.terminator
+            else:
+                msg = self.format(record).encode() + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += len(msg)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def doRollover(self):
+        self.flush()
+        super().doRollover()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue drains"""
+    
+    def dequeue(self, block: bool):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+# Background listener draining queued records to the file handlers
+_listener = None
+
+# Set once setup_logging() has run; later calls are no-ops
+_CONFIGURED = False
+
+
+def _stop_listener():
+    """Flush and stop the file logging listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def setup_logging():
-    """Configure logging for the application"""
+    """Configure logging for the application (runs once per process)"""
+    global _listener, _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
     
     # Remove existing handlers
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_listener()
     
     # Set log level
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
@@ -120,24 +248,30 @@ def setup_logging():
             os.makedirs('logs', exist_ok=True)
             
             # Error file handler
-            error_handler = logging.handlers.RotatingFileHandler(
+            error_handler = _BufferedRotatingFileHandler(
                 'logs/error.log',
                 maxBytes=10*1024*1024,  # 10MB
                 backupCount=5
             )
             error_handler.setLevel(logging.ERROR)
             error_handler.setFormatter(JSONFormatter())
-            root_logger.addHandler(error_handler)
             
             # Application file handler
-            app_handler = logging.handlers.RotatingFileHandler(
+            app_handler = _BufferedRotatingFileHandler(
                 'logs/app.log',
                 maxBytes=50*1024*1024,  # 50MB
                 backupCount=3
             )
             app_handler.setLevel(logging.INFO)
             app_handler.setFormatter(JSONFormatter())
-            root_logger.addHandler(app_handler)
+            
+            # File writes happen on the listener thread; request paths only enqueue
+            log_queue = queue.SimpleQueue()
+            _listener = _FlushingQueueListener(
+                log_queue, error_handler, app_handler, respect_handler_level=True
+            )
+            root_logger.addHandler(_LocalQueueHandler(log_queue))
+            _listener.start()
             
         except Exception as e:
             # If file logging fails, log to console
@@ -151,29 +285,51 @@ def setup_logging():
     logger.info(f"Logging configured - Level: {settings.log_level}, Environment: {settings.environment}")
 
 
-def configure_loggers():
-    """Configure specific loggers"""
-    
+# Per-logger levels applied by configure_loggers()
+LOGGER_LEVELS = {
     # Reduce noise from third-party libraries
-    logging.getLogger('uvicorn.access').setLevel(logging.WARNING)
-    logging.getLogger('uvicorn.error').setLevel(logging.INFO)
-    
+    'uvicorn.access': logging.WARNING,
+    'uvicorn.error': logging.INFO,
     # SQLAlchemy logging
-    if settings.is_production:
-        logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
-        logging.getLogger('sqlalchemy.pool').setLevel(logging.WARNING)
-    else:
-        logging.getLogger('sqlalchemy.engine').setLevel(logging.INFO)
-    
+    'sqlalchemy.engine': logging.WARNING if settings.is_production else logging.INFO,
+    **({'sqlalchemy.pool': logging.WARNING} if settings.is_production else {}),
     # HTTP client logging
-    logging.getLogger('httpx').setLevel(logging.WARNING)
-    logging.getLogger('requests').setLevel(logging.WARNING)
-    
+    'httpx': logging.WARNING,
+    'requests': logging.WARNING,
     # Application loggers
-    logging.getLogger('app').setLevel(logging.INFO)
-    logging.getLogger('app.auth').setLevel(logging.INFO)
-    logging.getLogger('app.security').setLevel(logging.INFO)
-    logging.getLogger('app.monitoring').setLevel(logging.INFO)
+    'app': logging.INFO,
+    'app.auth': logging.INFO,
+    'app.security': logging.INFO,
+    'app.monitoring': logging.INFO,
+}
+
+
+def configure_loggers():
+    """Configure specific loggers"""
+    for name, level in LOGGER_LEVELS.items():
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        
+        # In production, third-party loggers that already have their own handler
+        # (e.g. uvicorn's) shouldn't re-emit every record through the root JSON handler
+        if settings.is_production and not name.startswith('app') and logger.handlers:
+            logger.propagate = False
+
+
+# Loggers used by the helpers below, looked up once instead of per call
+_REQ_LOG = logging.getLogger('app.requests')
+_AUTH_LOG = logging.getLogger('app.auth')
+_SEC_LOG = logging.getLogger('app.security')
+_ERR_LOG = logging.getLogger('app.errors')
+_DB_LOG = logging.getLogger('app.database')
+_API_LOG = logging.getLogger('app.external_api')
+
+# Security event severity -> log level
+_SEVERITY_LEVELS = {
+    "critical": logging.CRITICAL,
+    "high": logging.ERROR,
+    "medium": logging.WARNING,
+}
 
 
 class RequestLogger:
@@ -190,7 +346,18 @@ class RequestLogger:
         request_id: str = None
     ):
         """Log HTTP request"""
-        logger = logging.getLogger('app.requests')
+        logger = _REQ_LOG
+        
+        # Determine log level based on status code
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        
+        if not logger.isEnabledFor(level):
+            return
         
         extra = {
             'method': method,
@@ -208,13 +375,7 @@ class RequestLogger:
         if request_id:
             extra['request_id'] = request_id
         
-        # Determine log level based on status code
-        if status_code >= 500:
-            logger.error(f"{method} {path} - {status_code} ({extra['response_time']}ms)", extra=extra)
-        elif status_code >= 400:
-            logger.warning(f"{method} {path} - {status_code} ({extra['response_time']}ms)", extra=extra)
-        else:
-            logger.info(f"{method} {path} - {status_code} ({extra['response_time']}ms)", extra=extra)
+        logger.log(level, "%s %s - %d (%sms)", method, path, status_code, extra['response_time'], extra=extra)
     
     @staticmethod
     def log_auth_attempt(
@@ -224,7 +385,11 @@ class RequestLogger:
         reason: str = None
     ):
         """Log authentication attempt"""
-        logger = logging.getLogger('app.auth')
+        logger = _AUTH_LOG
+        
+        level = logging.INFO if success else logging.WARNING
+        if not logger.isEnabledFor(level):
+            return
         
         extra = {
             'username': username,
@@ -238,9 +403,9 @@ class RequestLogger:
             extra['reason'] = reason
         
         if success:
-            logger.info(f"Successful login for user: {username}", extra=extra)
+            logger.info("Successful login for user: %s", username, extra=extra)
         else:
-            logger.warning(f"Failed login attempt for user: {username} - {reason}", extra=extra)
+            logger.warning("Failed login attempt for user: %s - %s", username, reason, extra=extra)
     
     @staticmethod
     def log_security_event(
@@ -251,7 +416,12 @@ class RequestLogger:
         severity: str = "medium"
     ):
         """Log security event"""
-        logger = logging.getLogger('app.security')
+        logger = _SEC_LOG
+        
+        # Determine log level based on severity
+        level = _SEVERITY_LEVELS.get(severity, logging.INFO)
+        if not logger.isEnabledFor(level):
+            return
         
         extra = {
             'event_type': event_type,
@@ -264,15 +434,7 @@ class RequestLogger:
         if user_id:
             extra['user_id'] = user_id
         
-        # Determine log level based on severity
-        if severity == "critical":
-            logger.critical(f"Security event: {event_type} - {description}", extra=extra)
-        elif severity == "high":
-            logger.error(f"Security event: {event_type} - {description}", extra=extra)
-        elif severity == "medium":
-            logger.warning(f"Security event: {event_type} - {description}", extra=extra)
-        else:
-            logger.info(f"Security event: {event_type} - {description}", extra=extra)
+        logger.log(level, "Security event: %s - %s", event_type, description, extra=extra)
 
 
 class ErrorLogger:
@@ -286,7 +448,9 @@ class ErrorLogger:
         request_id: str = None
     ):
         """Log exception with context"""
-        logger = logging.getLogger('app.errors')
+        logger = _ERR_LOG
+        if not logger.isEnabledFor(logging.ERROR):
+            return
         
         extra = {
             'exception_type': type(exception).__name__,
@@ -301,7 +465,8 @@ class ErrorLogger:
         if request_id:
             extra['request_id'] = request_id
         
-        logger.error(f"Exception occurred: {str(exception)}", exc_info=True, extra=extra)
+        # Pass the exception itself so the traceback is captured even outside an except block
+        logger.error("Exception occurred: %s", exception, exc_info=exception, extra=extra)
     
     @staticmethod
     def log_database_error(
@@ -311,7 +476,9 @@ class ErrorLogger:
         user_id: str = None
     ):
         """Log database error"""
-        logger = logging.getLogger('app.database')
+        logger = _DB_LOG
+        if not logger.isEnabledFor(logging.ERROR):
+            return
         
         extra = {
             'operation': operation,
@@ -324,7 +491,7 @@ class ErrorLogger:
         if user_id:
             extra['user_id'] = user_id
         
-        logger.error(f"Database error during {operation}: {str(error)}", exc_info=True, extra=extra)
+        logger.error("Database error during %s: %s", operation, error, exc_info=True, extra=extra)
     
     @staticmethod
     def log_api_error(
@@ -334,7 +501,9 @@ class ErrorLogger:
         user_id: str = None
     ):
         """Log external API error"""
-        logger = logging.getLogger('app.external_api')
+        logger = _API_LOG
+        if not logger.isEnabledFor(logging.ERROR):
+            return
         
         extra = {
             'service': service,
@@ -347,8 +516,4 @@ class ErrorLogger:
         if user_id:
             extra['user_id'] = user_id
         
-        logger.error(f"External API error ({service}): {str(error)}", exc_info=True, extra=extra)
-
-
-# Initialize logging when module is imported
-setup_logging()
\ No newline at end of file
+        logger.error("External API error (%s): %s", service, error, exc_info=True, extra=extra)
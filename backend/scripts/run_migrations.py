@@ -5,7 +5,6 @@ Alembic migration runner for production deployment
 
 import os
 import sys
-import subprocess
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -18,29 +17,26 @@ def run_alembic_upgrade():
         logger.info("Running Alembic migrations...")
         
         # Change to the backend directory
-        backend_dir = os.path.dirname(os.path.dirname(__file__))
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         os.chdir(backend_dir)
         
-        # Run alembic upgrade
-        result = subprocess.run(
-            ["alembic", "upgrade", "head"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # Imported here so a missing install is reported like the CLI case was
+        from alembic import command
+        from alembic.config import Config
+        
+        # Run alembic upgrade in-process (env.py configures the alembic loggers)
+        command.upgrade(Config(os.path.join(backend_dir, "alembic.ini")), "head")
         
         logger.info("Alembic migrations completed successfully!")
-        logger.info(f"Output: {result.stdout}")
         
         return True
         
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Alembic migration failed: {e}")
-        logger.error(f"Error output: {e.stderr}")
-        return False
-    except FileNotFoundError:
+    except ImportError:
         logger.error("Alembic not found. Make sure it's installed: pip install alembic")
         return False
+    except Exception as e:
+        logger.error(f"Alembic migration failed: {e}")
+        return False
 
 
 def main():
@@ -6,33 +6,104 @@ Tests all major API endpoints and functionality
 
 import os
 import sys
-import json
-import time
+import asyncio
+import hashlib
 import logging
-import requests
-from datetime import datetime
+import time
+import types
+import importlib.util
+import httpx
+import orjson
+from pathlib import Path
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BULK_IDEAS = 5  # Ideas created by the single bulk request
+CONCURRENT_IDEAS = 10  # Single-idea creates fired in parallel with the same token
+MAX_CONCURRENT_REQUESTS = 8
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Enhancement responses are reused across runs unless REFRESH_AI=1
+AI_CACHE_DIR = Path(os.getenv("AI_CACHE_DIR", Path(__file__).parent / ".ai_cache"))
+
+
+class RetryAfterTransport(httpx.AsyncHTTPTransport):
+    """Waits out 429 responses for as long as the server's Retry-After asks, instead of pacing every test"""
+    
+    async def handle_async_request(self, request):
+        for _ in range(MAX_RATE_LIMIT_RETRIES):
+            response = await super().handle_async_request(request)
+            if response.status_code != 429:
+                return response
+            
+            retry_after = response.headers.get("Retry-After", "1")
+            delay = int(retry_after) if retry_after.isdigit() else 1
+            await response.aclose()
+            logger.warning(f"⚠️ Rate limited on {request.url.path}, retrying in {delay}s")
+            await asyncio.sleep(delay)
+        
+        return await super().handle_async_request(request)
+
 
 class APITester:
-    def __init__(self, base_url):
+    def __init__(self, base_url, pace=True):
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+        # One client for every test: keep-alive pooling, and HTTP/2 multiplexing when h2 is installed.
+        # With pace=False a 429 fails the test immediately instead of honouring Retry-After.
+        transport_cls = RetryAfterTransport if pace else httpx.AsyncHTTPTransport
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport_cls(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(max_connections=16)
+            ),
+            timeout=30,
+            follow_redirects=True  # Match requests' default
+        )
+        # Unique per tester, so registration and login always target the same fresh user
+        self.run_id = f"{time.time_ns()}_{os.getpid()}"
+        # Fixed endpoints, resolved against base_url by the client
+        self.urls = types.SimpleNamespace(
+            root="/",
+            health="/health",
+            register="/auth/register",
+            login="/auth/token",
+            ideas="/ideas",
+            ideas_bulk="/ideas/bulk"
+        )
         self.auth_token = None
+        self.test_username = None
         self.test_user_id = None
         self.test_idea_id = None
+        self.test_idea_ids = []
+        self.test_ideas = []
+        self.concurrent_idea_ids = []
         
-    def test_health_endpoints(self):
+    def _post_json(self, path, obj, **kwargs):
+        """POST obj as a JSON body, encoded with orjson rather than the stdlib json httpx uses"""
+        return self.client.post(
+            path,
+            content=orjson.dumps(obj),
+            headers={"Content-Type": "application/json"},
+            **kwargs
+        )
+    
+    async def test_health_endpoints(self):
         """Test health and basic endpoints"""
         logger.info("Testing health endpoints...")
         
         try:
+            # Root and health are independent; fire both at once
+            root_response, health_response = await asyncio.gather(
+                self.client.get(self.urls.root),
+                self.client.get(self.urls.health)
+            )
+            
             # Test root endpoint
-            response = self.session.get(f"{self.base_url}/", timeout=30)
+            response = root_response
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 logger.info(f"✅ Root endpoint: {data.get('message', 'OK')}")
                 logger.info(f"   Version: {data.get('version', 'Unknown')}")
                 logger.info(f"   Environment: {data.get('environment', 'Unknown')}")
@@ -41,9 +112,9 @@ class APITester:
                 return False
             
             # Test health endpoint
-            response = self.session.get(f"{self.base_url}/health", timeout=30)
+            response = health_response
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = orjson.loads(response.content)
                 logger.info(f"✅ Health endpoint: {health_data.get('status', 'Unknown')}")
                 logger.info(f"   Database: {health_data.get('database', 'Unknown')}")
                 
@@ -62,27 +133,27 @@ class APITester:
             logger.error(f"Health endpoint test failed: {e}")
             return False
     
-    def test_user_registration(self):
+    async def test_user_registration(self):
         """Test user registration"""
         logger.info("Testing user registration...")
         
         try:
-            timestamp = int(datetime.now().timestamp())
             test_user = {
-                "username": f"testuser_{timestamp}",
-                "email": f"test_{timestamp}@example.com",
+                "username": f"testuser_{self.run_id}",
+                "email": f"test_{self.run_id}@example.com",
                 "password": "testpassword123"
             }
             
-            response = self.session.post(
-                f"{self.base_url}/auth/register",
-                json=test_user,
+            response = await self._post_json(
+                self.urls.register,
+                test_user,
                 timeout=30
             )
             
             if response.status_code == 201:
-                user_data = response.json()
+                user_data = orjson.loads(response.content)
                 self.test_user_id = user_data.get('id')
+                self.test_username = test_user["username"]
                 logger.info(f"✅ User registration successful")
                 logger.info(f"   User ID: {self.test_user_id}")
                 logger.info(f"   Username: {user_data.get('username')}")
@@ -96,33 +167,30 @@ class APITester:
             logger.error(f"User registration test failed: {e}")
             return False
     
-    def test_user_login(self):
+    async def test_user_login(self):
         """Test user login and get auth token"""
         logger.info("Testing user login...")
         
         try:
-            timestamp = int(datetime.now().timestamp())
             login_data = {
-                "username": f"testuser_{timestamp}",
+                "username": self.test_username,
                 "password": "testpassword123"
             }
             
-            response = self.session.post(
-                f"{self.base_url}/auth/login",
+            response = await self.client.post(
+                self.urls.login,
                 data=login_data,  # Form data for OAuth2
                 timeout=30
             )
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = orjson.loads(response.content)
                 self.auth_token = token_data.get('access_token')
                 logger.info(f"✅ User login successful")
                 logger.info(f"   Token type: {token_data.get('token_type')}")
                 
                 # Set authorization header for future requests
-                self.session.headers.update({
-                    'Authorization': f"Bearer {self.auth_token}"
-                })
+                self.client.headers['Authorization'] = f"Bearer {self.auth_token}"
                 
                 return True
             else:
@@ -134,30 +202,38 @@ class APITester:
             logger.error(f"User login test failed: {e}")
             return False
     
-    def test_create_idea(self):
-        """Test idea creation"""
+    async def test_create_idea(self):
+        """Test idea creation (one bulk request for the whole batch)"""
         logger.info("Testing idea creation...")
         
         try:
-            test_idea = {
-                "title": "AI-Powered Test Automation Platform",
-                "description": "A comprehensive testing platform that uses artificial intelligence to automatically generate, execute, and maintain test cases for web applications.",
-                "development_stage": "concept"
-            }
+            test_ideas = [
+                {
+                    "title": f"AI-Powered Test Automation Platform #{i}",
+                    "description": "A comprehensive testing platform that uses artificial intelligence to automatically generate, execute, and maintain test cases for web applications.",
+                    "development_stage": "concept"
+                }
+                for i in range(1, BULK_IDEAS + 1)
+            ]
             
-            response = self.session.post(
-                f"{self.base_url}/ideas",
-                json=test_idea,
+            start = time.perf_counter()
+            response = await self._post_json(
+                self.urls.ideas_bulk,
+                {"items": test_ideas},
                 timeout=30
             )
             
             if response.status_code == 201:
-                idea_data = response.json()
-                self.test_idea_id = idea_data.get('id')
+                ideas_data = orjson.loads(response.content)
+                self.test_ideas = test_ideas
+                self.test_idea_ids = [idea['id'] for idea in ideas_data]
+                self.test_idea_id = self.test_idea_ids[0]
+                per_item_ms = (time.perf_counter() - start) * 1000 / len(ideas_data)
                 logger.info(f"✅ Idea creation successful")
-                logger.info(f"   Idea ID: {self.test_idea_id}")
-                logger.info(f"   Title: {idea_data.get('title')}")
-                logger.info(f"   Stage: {idea_data.get('development_stage')}")
+                logger.info(f"   Idea IDs: {self.test_idea_ids}")
+                logger.info(f"   Title: {ideas_data[0].get('title')}")
+                logger.info(f"   Stage: {ideas_data[0].get('development_stage')}")
+                logger.info(f"   Latency per idea: {per_item_ms:.1f}ms")
                 return True
             else:
                 logger.error(f"❌ Idea creation failed: {response.status_code}")
@@ -168,22 +244,80 @@ class APITester:
             logger.error(f"Idea creation test failed: {e}")
             return False
     
-    def test_get_ideas(self):
-        """Test getting ideas list"""
+    async def _create_many(self, n=CONCURRENT_IDEAS):
+        """POST n ideas concurrently, at most MAX_CONCURRENT_REQUESTS in flight"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def create(i):
+            async with semaphore:
+                return await self._post_json(
+                    self.urls.ideas,
+                    {
+                        "title": f"Concurrent Test Idea #{i}",
+                        "description": "An idea created in parallel with others to check token reuse and transaction throughput.",
+                        "development_stage": "research"
+                    },
+                    timeout=60  # Each create runs AI enhancement
+                )
+        
+        return await asyncio.gather(*(create(i) for i in range(1, n + 1)), return_exceptions=True)
+    
+    async def test_concurrent_creates(self):
+        """Test many idea creations in parallel with the same bearer token"""
+        logger.info("Testing concurrent idea creation...")
+        
+        try:
+            start = time.perf_counter()
+            responses = await self._create_many()
+            elapsed = time.perf_counter() - start
+            
+            created = [r for r in responses if not isinstance(r, Exception) and r.status_code == 201]
+            self.concurrent_idea_ids = [orjson.loads(r.content)['id'] for r in created]
+            
+            if len(created) == len(responses):
+                logger.info(f"✅ Concurrent creation successful")
+                logger.info(f"   Created: {len(created)} ideas in {elapsed:.2f}s")
+                return True
+            
+            for r in responses:
+                if isinstance(r, Exception):
+                    logger.error(f"   Request error: {r}")
+                elif r.status_code != 201:
+                    logger.error(f"   {r.status_code}: {r.text}")
+            logger.error(f"❌ Concurrent creation failed: {len(created)}/{len(responses)} created")
+            return False
+            
+        except Exception as e:
+            logger.error(f"Concurrent creation test failed: {e}")
+            return False
+    
+    async def test_get_ideas(self):
+        """Test getting ideas list and filtering by stage in one request"""
         logger.info("Testing get ideas...")
         
         try:
-            response = self.session.get(
-                f"{self.base_url}/ideas",
+            # Only the count is checked, so ask for a single item rather than the whole page
+            params = {"stage": "concept", "limit": 1}
+            if self.test_idea_ids:
+                params["ids"] = ",".join(map(str, self.test_idea_ids))
+            
+            response = await self.client.get(
+                self.urls.ideas,
+                params=params,
                 timeout=30
             )
             
             if response.status_code == 200:
-                ideas_data = response.json()
-                ideas_count = len(ideas_data.get('items', []))
+                ideas_data = orjson.loads(response.content)
+                total = ideas_data.get('total', 0)
                 logger.info(f"✅ Get ideas successful")
-                logger.info(f"   Ideas count: {ideas_count}")
-                logger.info(f"   Total: {ideas_data.get('total', 0)}")
+                logger.info(f"   Total: {total}")
+                
+                # Every idea we just created is a concept, so all must be counted
+                if self.test_idea_ids and total != len(self.test_idea_ids):
+                    logger.error(f"❌ Idea filtering matched {total} of {len(self.test_idea_ids)} ideas")
+                    return False
+                logger.info(f"✅ Idea filtering successful")
                 return True
             else:
                 logger.error(f"❌ Get ideas failed: {response.status_code}")
@@ -194,7 +328,7 @@ class APITester:
             logger.error(f"Get ideas test failed: {e}")
             return False
     
-    def test_ai_enhancement(self):
+    async def test_ai_enhancement(self):
         """Test AI enhancement functionality"""
         logger.info("Testing AI enhancement...")
         
@@ -202,14 +336,32 @@ class APITester:
             logger.warning("⚠️ Skipping AI enhancement test - no test idea available")
             return True
         
+        # Keyed on the deployment and the idea content, so a cached pass never vouches for another base_url
+        key = hashlib.sha256(
+            self.base_url.encode() + b"\n" + orjson.dumps(self.test_ideas[0], option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        cache_file = AI_CACHE_DIR / f"{key}.json"
+        
+        if cache_file.exists() and not os.getenv("REFRESH_AI"):
+            enhanced_data = orjson.loads(cache_file.read_bytes())
+            if "ai_validated" in enhanced_data and "feasibility_score" in enhanced_data:
+                logger.warning(f"⚠️ AI enhancement served from cache - /enhance was NOT called this run (set REFRESH_AI=1 for a live check)")
+                logger.info(f"   Cached from: {self.base_url}")
+                logger.info(f"   AI validated: {enhanced_data.get('ai_validated')}")
+                logger.info(f"   Feasibility score: {enhanced_data.get('feasibility_score')}")
+                return True
+            logger.warning(f"⚠️ Ignoring malformed AI cache entry: {cache_file.name}")
+        
         try:
-            response = self.session.post(
-                f"{self.base_url}/ideas/{self.test_idea_id}/enhance",
+            response = await self.client.post(
+                f"{self.urls.ideas}/{self.test_idea_id}/enhance",
                 timeout=60  # AI calls can take longer
             )
             
             if response.status_code == 200:
-                enhanced_data = response.json()
+                enhanced_data = orjson.loads(response.content)
+                AI_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_file.write_bytes(response.content)
                 logger.info(f"✅ AI enhancement successful")
                 logger.info(f"   AI validated: {enhanced_data.get('ai_validated')}")
                 logger.info(f"   Feasibility score: {enhanced_data.get('feasibility_score')}")
@@ -226,44 +378,34 @@ class APITester:
             logger.warning("⚠️ AI enhancement failed but continuing tests...")
             return True
     
-    def test_idea_filtering(self):
-        """Test idea filtering and search"""
-        logger.info("Testing idea filtering...")
-        
-        try:
-            # Test filtering by stage
-            response = self.session.get(
-                f"{self.base_url}/ideas?development_stage=concept",
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                filtered_data = response.json()
-                logger.info(f"✅ Idea filtering successful")
-                logger.info(f"   Filtered results: {len(filtered_data.get('items', []))}")
-                return True
-            else:
-                logger.error(f"❌ Idea filtering failed: {response.status_code}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Idea filtering test failed: {e}")
-            return False
-    
-    def cleanup_test_data(self):
+    async def cleanup_test_data(self):
         """Clean up test data"""
         logger.info("Cleaning up test data...")
         
         try:
-            if self.test_idea_id:
-                response = self.session.delete(
-                    f"{self.base_url}/ideas/{self.test_idea_id}",
+            idea_ids = self.test_idea_ids + self.concurrent_idea_ids
+            if idea_ids:
+                # One round-trip for the whole teardown
+                response = await self.client.delete(
+                    self.urls.ideas,
+                    params={"ids": ",".join(map(str, idea_ids))},
                     timeout=30
                 )
                 if response.status_code == 200:
-                    logger.info("✅ Test idea deleted")
+                    deleted = orjson.loads(response.content).get('deleted_count', 0)
+                    logger.info(f"✅ Deleted {deleted} of {len(idea_ids)} test ideas")
                 else:
-                    logger.warning(f"⚠️ Failed to delete test idea: {response.status_code}")
+                    # Older deployments without the bulk endpoint: delete one by one, in parallel
+                    logger.info(f"ℹ️ Bulk delete unavailable ({response.status_code}), deleting individually")
+                    responses = await asyncio.gather(*(
+                        self.client.delete(f"{self.urls.ideas}/{idea_id}", timeout=30)
+                        for idea_id in idea_ids
+                    ))
+                    for idea_id, response in zip(idea_ids, responses):
+                        if response.status_code == 200:
+                            logger.info(f"✅ Test idea {idea_id} deleted")
+                        else:
+                            logger.warning(f"⚠️ Failed to delete test idea {idea_id}: {response.status_code}")
             
             # Note: We don't delete the test user as it might be useful for debugging
             logger.info("✅ Cleanup completed")
@@ -271,38 +413,46 @@ class APITester:
         except Exception as e:
             logger.warning(f"Cleanup failed: {e}")
     
-    def run_all_tests(self):
+    async def run_all_tests(self):
         """Run all API tests"""
         logger.info(f"Starting API tests for: {self.base_url}")
         
-        tests = [
-            ("Health Endpoints", self.test_health_endpoints),
-            ("User Registration", self.test_user_registration),
-            ("User Login", self.test_user_login),
-            ("Create Idea", self.test_create_idea),
-            ("Get Ideas", self.test_get_ideas),
-            ("AI Enhancement", self.test_ai_enhancement),
-            ("Idea Filtering", self.test_idea_filtering),
-        ]
-        
         passed = 0
         failed = 0
         
-        for test_name, test_func in tests:
+        async def run(test_name, test_func):
             logger.info(f"\n--- Running: {test_name} ---")
             try:
-                if test_func():
-                    passed += 1
-                else:
-                    failed += 1
+                return bool(await test_func())
             except Exception as e:
                 logger.error(f"Test {test_name} crashed: {e}")
+                return False
+        
+        # Each step depends on the previous one (user -> token -> idea)
+        chain = [
+            ("Health Endpoints", self.test_health_endpoints),
+            ("User Registration", self.test_user_registration),
+            ("User Login", self.test_user_login),
+            ("Create Idea", self.test_create_idea),
+        ]
+        for test_name, test_func in chain:
+            if await run(test_name, test_func):
+                passed += 1
+            else:
                 failed += 1
-            
-            time.sleep(1)  # Brief pause between tests
+        
+        # The remaining tests only read (or enhance) the ideas created above, or create their own; run them concurrently
+        results = await asyncio.gather(
+            run("Get Ideas", self.test_get_ideas),
+            run("AI Enhancement", self.test_ai_enhancement),
+            run("Concurrent Creates", self.test_concurrent_creates),
+        )
+        passed += sum(results)
+        failed += len(results) - sum(results)
         
         # Cleanup
-        self.cleanup_test_data()
+        await self.cleanup_test_data()
+        await self.client.aclose()
         
         # Results
         total = passed + failed
@@ -323,12 +473,15 @@ def main():
     # Get API URL from environment or command line
     api_url = os.getenv('API_URL')
     
-    if len(sys.argv) > 1:
-        api_url = sys.argv[1]
+    args = [arg for arg in sys.argv[1:] if arg != "--no-pace"]
+    pace = "--no-pace" not in sys.argv[1:]
+    
+    if args:
+        api_url = args[0]
     
     if not api_url:
         logger.error("API URL not provided")
-        logger.info("Usage: python test_api.py <api_url>")
+        logger.info("Usage: python test_api.py [--no-pace] <api_url>")
         logger.info("   or: export API_URL=<api_url> && python test_api.py")
         sys.exit(1)
     
@@ -339,8 +492,8 @@ def main():
     logger.info(f"Testing API at: {api_url}")
     
     # Run tests
-    tester = APITester(api_url)
-    success = tester.run_all_tests()
+    tester = APITester(api_url, pace=pace)
+    success = asyncio.run(tester.run_all_tests())
     
     if success:
         logger.info("🎉 All API tests passed!")
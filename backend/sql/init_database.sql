@@ -7,12 +7,19 @@
 -- Connect to the database
 -- \c ideaforge_ai;
 
--- Create enum types
-CREATE TYPE user_role AS ENUM ('admin', 'contributor');
-CREATE TYPE development_stage AS ENUM ('concept', 'research', 'prototype', 'testing', 'launch');
+-- Create enum types (idempotent so the whole script can be re-run as one batch)
+DO $$ BEGIN
+    CREATE TYPE user_role AS ENUM ('admin', 'contributor');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE development_stage AS ENUM ('concept', 'research', 'prototype', 'testing', 'launch');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
 
 -- Users table
-CREATE TABLE users (
+CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     username VARCHAR(50) UNIQUE NOT NULL,
     email VARCHAR(100) UNIQUE NOT NULL,
@@ -22,7 +29,7 @@ CREATE TABLE users (
 );
 
 -- Ideas table
-CREATE TABLE ideas (
+CREATE TABLE IF NOT EXISTS ideas (
     id SERIAL PRIMARY KEY,
     title VARCHAR(500) NOT NULL,
     description TEXT NOT NULL,
@@ -38,7 +45,7 @@ CREATE TABLE ideas (
 );
 
 -- Idea insights table
-CREATE TABLE idea_insights (
+CREATE TABLE IF NOT EXISTS idea_insights (
     id SERIAL PRIMARY KEY,
     idea_id INTEGER NOT NULL REFERENCES ideas(id) ON DELETE CASCADE,
     market_insights TEXT,
@@ -51,13 +58,13 @@ CREATE TABLE idea_insights (
 );
 
 -- Create indexes for performance
-CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_ideas_created_by ON ideas(created_by);
-CREATE INDEX idx_ideas_development_stage ON ideas(development_stage);
-CREATE INDEX idx_ideas_ai_validated ON ideas(ai_validated);
-CREATE INDEX idx_ideas_created_at ON ideas(created_at);
-CREATE INDEX idx_idea_insights_idea_id ON idea_insights(idea_id);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_ideas_created_by ON ideas(created_by);
+CREATE INDEX IF NOT EXISTS idx_ideas_development_stage ON ideas(development_stage);
+CREATE INDEX IF NOT EXISTS idx_ideas_ai_validated ON ideas(ai_validated);
+CREATE INDEX IF NOT EXISTS idx_ideas_created_at ON ideas(created_at);
+CREATE INDEX IF NOT EXISTS idx_idea_insights_idea_id ON idea_insights(idea_id);
 
 -- Create function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -69,11 +76,13 @@ END;
 $$ language 'plpgsql';
 
 -- Create triggers for updated_at
+DROP TRIGGER IF EXISTS update_ideas_updated_at ON ideas;
 CREATE TRIGGER update_ideas_updated_at 
     BEFORE UPDATE ON ideas 
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_idea_insights_updated_at ON idea_insights;
 CREATE TRIGGER update_idea_insights_updated_at 
     BEFORE UPDATE ON idea_insights 
     FOR EACH ROW 
@@ -82,15 +91,21 @@ CREATE TRIGGER update_idea_insights_updated_at
 -- Insert default admin user (password: admin123 - change in production!)
 -- Password hash for 'admin123' using bcrypt
 INSERT INTO users (username, email, hashed_password, role) VALUES 
-('admin', 'admin@ideaforge.ai', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj3bp.Gm.F5W', 'admin');
+('admin', 'admin@ideaforge.ai', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj3bp.Gm.F5W', 'admin')
+ON CONFLICT DO NOTHING;
 
 -- Create sample data (optional - remove for production)
 INSERT INTO users (username, email, hashed_password, role) VALUES 
-('demo_user', 'demo@ideaforge.ai', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj3bp.Gm.F5W', 'contributor');
+('demo_user', 'demo@ideaforge.ai', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj3bp.Gm.F5W', 'contributor')
+ON CONFLICT DO NOTHING;
 
-INSERT INTO ideas (title, description, development_stage, created_by, ai_validated) VALUES 
+INSERT INTO ideas (title, description, development_stage, created_by, ai_validated)
+SELECT v.title, v.description, v.development_stage::development_stage, v.created_by, v.ai_validated
+FROM (VALUES 
 ('AI-Powered Personal Finance Coach', 'An intelligent financial advisor that uses machine learning to provide personalized budgeting and investment advice.', 'concept', 2, false),
-('Smart Urban Farming System', 'IoT-enabled vertical farming solution for urban environments with automated nutrient delivery and climate control.', 'research', 2, false);
+('Smart Urban Farming System', 'IoT-enabled vertical farming solution for urban environments with automated nutrient delivery and climate control.', 'research', 2, false)
+) AS v(title, description, development_stage, created_by, ai_validated)
+WHERE NOT EXISTS (SELECT 1 FROM ideas i WHERE i.title = v.title);
 
 -- Grant permissions (adjust as needed)
 -- GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA public TO your_app_user;
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+# Each pytest-xdist worker (`pytest -n auto`) gets its own SQLite file, so
+# fixed usernames like "testuser" don't collide across workers. This must be
+# set before the app (and its engine) is imported.
+_DB_PATH = f"./test_{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+
+from app.database import Base, engine  # noqa: E402
+from app import models  # noqa: E402,F401  (registers the tables on Base.metadata)
+from app.main import app  # noqa: E402
+from app.auth import auth  # noqa: E402
+
+# bcrypt's work factor dominates /auth/register; tests only need a working
+# hash, so swap in single-round PBKDF2. conftest is only loaded by pytest,
+# so the production context is untouched.
+auth.pwd_context = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=1)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _reset_db():
+    # Fresh tables for every test module
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One app lifespan (startup/shutdown) for the whole session
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _remove_db_file():
+    yield
+    engine.dispose()
+    if os.path.exists(_DB_PATH):
+        os.remove(_DB_PATH)
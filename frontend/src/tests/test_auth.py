@@ -1,10 +1,21 @@
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
 
-def test_register_user():
+@pytest.fixture(scope="module")
+def logintest_user(client):
+    # Registered once and shared by the login tests; module scope matches the
+    # lifetime of the tables (conftest resets them per module)
+    client.post(
+        "/auth/register",
+        json={
+            "username": "logintest",
+            "email": "logintest@example.com",
+            "password": "testpassword"
+        }
+    )
+    return {"username": "logintest", "password": "testpassword"}
+
+def test_register_user(client):
     response = client.post(
         "/auth/register",
         json={
@@ -18,30 +29,19 @@ def test_register_user():
     assert data["username"] == "testuser"
     assert "id" in data
 
-def test_login_user():
-    # First register
-    client.post(
-        "/auth/register",
-        json={
-            "username": "logintest",
-            "email": "logintest@example.com",
-            "password": "testpassword"
-        }
-    )
-
-    # Then login
+def test_login_user(client, logintest_user):
     response = client.post(
         "/auth/token",
-        data={"username": "logintest", "password": "testpassword"},
+        data={"username": logintest_user["username"], "password": logintest_user["password"]},
     )
     assert response.status_code == 200
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
 
-def test_login_wrong_password():
+def test_login_wrong_password(client, logintest_user):
     response = client.post(
         "/auth/token",
-        data={"username": "logintest", "password": "wrongpass"},
+        data={"username": logintest_user["username"], "password": "wrongpass"},
     )
     assert response.status_code == 401
@@ -0,0 +1,114 @@
+import sys
+import types
+
+import pytest
+
+STUB_SCORES = (7.0, 4.0, 3.0)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _stub_ai():
+    # Keep the suite hermetic: the routers import ai_service lazily, so a stub
+    # module means Gemini is never configured or called, with or without
+    # GEMINI_API_KEY set
+    async def batch_feasibility(ideas):
+        return [STUB_SCORES for _ in ideas]
+
+    async def refine_and_score(title, description, stage):
+        return f"**Enhanced Business Pitch**\n\n{title}", STUB_SCORES
+
+    stub = types.ModuleType("app.services.ai_service")
+    stub.ai_service = types.SimpleNamespace(
+        batch_feasibility=batch_feasibility,
+        refine_and_score=refine_and_score
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, "app.services.ai_service", stub)
+        yield
+
+
+def _auth_headers(client, username):
+    client.post(
+        "/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "testpassword"
+        }
+    )
+    response = client.post(
+        "/auth/token",
+        data={"username": username, "password": "testpassword"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def owner_headers(client):
+    return _auth_headers(client, "ideaowner")
+
+
+@pytest.fixture(scope="module")
+def other_headers(client):
+    return _auth_headers(client, "otherowner")
+
+
+def _bulk_create(client, headers, count, stage="concept"):
+    response = client.post(
+        "/ideas/bulk",
+        json={
+            "items": [
+                {
+                    "title": f"Bulk idea {i}",
+                    "description": "An idea created through the bulk endpoint.",
+                    "development_stage": stage
+                }
+                for i in range(count)
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    ideas = response.json()
+    assert all(
+        (idea["market_potential"], idea["technical_complexity"], idea["resource_requirements"]) == STUB_SCORES
+        for idea in ideas
+    )
+    return [idea["id"] for idea in ideas]
+
+def test_bulk_create_then_filter_by_ids(client, owner_headers):
+    concept_ids = _bulk_create(client, owner_headers, 3)
+    research_ids = _bulk_create(client, owner_headers, 2, stage="research")
+    assert len(set(concept_ids + research_ids)) == 5
+
+    ids = ",".join(map(str, concept_ids + research_ids))
+    response = client.get(f"/ideas?ids={ids}&limit=1", headers=owner_headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 5
+
+    response = client.get(f"/ideas?ids={ids}&stage=concept&limit=100", headers=owner_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert sorted(idea["id"] for idea in data["items"]) == sorted(concept_ids)
+
+def test_bulk_delete_skips_other_users_ideas(client, owner_headers, other_headers):
+    own_ids = _bulk_create(client, owner_headers, 2)
+    other_ids = _bulk_create(client, other_headers, 2)
+
+    ids = ",".join(map(str, own_ids + other_ids))
+    response = client.delete(f"/ideas?ids={ids}", headers=owner_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(data["deleted_idea_ids"]) == sorted(own_ids)
+    assert data["deleted_count"] == 2
+
+    # The other user's ideas are untouched
+    other = ",".join(map(str, other_ids))
+    response = client.get(f"/ideas?ids={other}", headers=other_headers)
+    assert response.json()["total"] == 2
+
+@pytest.mark.parametrize("method", ["get", "delete"])
+def test_malformed_ids_returns_400(client, owner_headers, method):
+    response = getattr(client, method)("/ideas?ids=1,abc", headers=owner_headers)
+    assert response.status_code == 400